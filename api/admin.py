@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Muscle, Exercise, Training
+from .models import User, Muscle, Exercise, Training, ArchivedTraining, ExerciseStats, TrainingRollup
 
 
 @admin.register(User)
@@ -53,3 +53,30 @@ class TrainingAdmin(admin.ModelAdmin):
     list_filter = ['datetime', 'exercise__muscle']
     search_fields = ['exercise__name', 'user__email', 'user__username']
     date_hierarchy = 'datetime'
+
+
+@admin.register(ArchivedTraining)
+class ArchivedTrainingAdmin(admin.ModelAdmin):
+    """Admin configuration for ArchivedTraining model."""
+    
+    list_display = ['exercise', 'user', 'weight', 'sets', 'repetitions', 'datetime', 'archived_at']
+    list_filter = ['datetime', 'exercise__muscle']
+    search_fields = ['exercise__name', 'user__email', 'user__username']
+    date_hierarchy = 'datetime'
+
+
+@admin.register(ExerciseStats)
+class ExerciseStatsAdmin(admin.ModelAdmin):
+    """Admin configuration for ExerciseStats model."""
+    
+    list_display = ['exercise', 'user', 'low_weight', 'high_weight', 'last_weight', 'total_sessions']
+    search_fields = ['exercise__name', 'user__email', 'user__username']
+
+
+@admin.register(TrainingRollup)
+class TrainingRollupAdmin(admin.ModelAdmin):
+    """Admin configuration for TrainingRollup model."""
+    
+    list_display = ['exercise', 'user', 'granularity', 'bucket_start', 'volume', 'sessions']
+    list_filter = ['granularity']
+    search_fields = ['exercise__name', 'user__email', 'user__username']
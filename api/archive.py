@@ -0,0 +1,95 @@
+from django.db import connections, router, transaction
+from django.db.models import Max
+
+from .filters import get_period_bounds
+from .models import ArchivedTraining, Training
+
+
+ARCHIVE_FIELDS = ['id', 'user_id', 'exercise_id', 'weight', 'sets', 'repetitions', 'datetime', 'client_id']
+
+
+def get_newest_archived(user):
+    """Return the datetime of the newest archived training of a user, or None."""
+    return ArchivedTraining.objects.filter(user=user).aggregate(newest=Max('datetime'))['newest']
+
+
+def reaches_archive(user, period):
+    """
+    Return whether a history period may include archived trainings of a user.
+
+    Only one index lookup for users with an archive; the archive table is
+    queried for the rows themselves only when the period starts at or before
+    the user's newest archived training.
+    """
+    newest = get_newest_archived(user)
+    if newest is None:
+        return False
+    bounds = get_period_bounds(period)
+    return bounds is None or bounds[0] <= newest
+
+
+def move_to_archive(cutoff, after_id=0, batch_size=1000):
+    """
+    Move one batch of trainings older than ``cutoff`` into the archive table.
+
+    Trainings are taken in ID order after ``after_id`` so successive batches
+    walk the primary key once. Returns (number moved, last ID moved).
+    """
+    with transaction.atomic():
+        rows = list(
+            Training.objects
+            .select_for_update()
+            .filter(id__gt=after_id, datetime__lt=cutoff)
+            .order_by('id')
+            .values(*ARCHIVE_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0, after_id
+
+        ArchivedTraining.objects.bulk_create([ArchivedTraining(**row) for row in rows])
+        delete_trainings_quietly([row['id'] for row in rows])
+    return len(rows), rows[-1]['id']
+
+
+def restore_from_archive(user, **lookup):
+    """
+    Move one archived training of a user back into the training table.
+
+    Used before an archived training is updated or deleted, so the regular
+    write paths (signals, stats and rollups) apply to it. ``lookup`` is
+    ``id=...`` or ``client_id=...``. Returns False if no such archived
+    training exists.
+    """
+    with transaction.atomic():
+        row = (
+            ArchivedTraining.objects
+            .select_for_update()
+            .filter(user=user, **lookup)
+            .values(*ARCHIVE_FIELDS)
+            .first()
+        )
+        if row is None:
+            return False
+
+        # bulk_create keeps the ID and sends no signals: the training never
+        # disappeared for the API, and stats and rollups already count it
+        Training.objects.bulk_create([Training(**row)])
+        # auto_now_add ignores the explicit value
+        Training.objects.filter(id=row['id']).update(datetime=row['datetime'])
+        ArchivedTraining.objects.filter(id=row['id']).delete()
+    return True
+
+
+def delete_trainings_quietly(training_ids):
+    """
+    Delete training rows with a plain DELETE.
+
+    The trainings still exist for the API (in the archive), so the delete
+    signals (change log tombstones, data version bumps) must not fire.
+    """
+    connection = connections[router.db_for_write(Training)]
+    table = connection.ops.quote_name(Training._meta.db_table)
+    column = connection.ops.quote_name(Training._meta.pk.column)
+    placeholders = ', '.join(['%s'] * len(training_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({placeholders})', training_ids)
@@ -1,26 +1,269 @@
+import hashlib
+import threading
+import time
+import uuid
 import jwt
-from datetime import datetime, timedelta
+from copy import copy
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
 from rest_framework import authentication, exceptions
-from .models import User
+from . import metrics
+from .caching import BloomFilter, LRUCache
+from .db.routers import use_primary_if_pinned
+from .models import RevokedToken, User
 
 
-def generate_jwt_token(user):
-    """Generate JWT token for a user."""
+class UserCache:
+    """
+    Two-tier cache of authenticated users keyed by user ID.
+
+    Lookups hit an in-process LRU first, then the optional shared Django cache
+    named by JWT_USER_CACHE_ALIAS, then the database. Entries live for
+    JWT_USER_CACHE_TTL seconds and are invalidated by User save/delete signals,
+    so a deactivated or deleted user is rejected within the TTL at the latest.
+    """
+    
+    key_prefix = 'jwt-user'
+    
+    def __init__(self):
+        self._local = None
+    
+    @property
+    def local(self):
+        if self._local is None:
+            self._local = LRUCache(
+                max_size=getattr(settings, 'JWT_USER_CACHE_SIZE', 10000),
+                ttl=self.ttl
+            )
+        return self._local
+    
+    @property
+    def ttl(self):
+        return getattr(settings, 'JWT_USER_CACHE_TTL', 60)
+    
+    @property
+    def shared(self):
+        alias = getattr(settings, 'JWT_USER_CACHE_ALIAS', None)
+        return caches[alias] if alias else None
+    
+    def get_key(self, user_id):
+        return f'{self.key_prefix}:{user_id}'
+    
+    def get(self, user_id):
+        """Return a private copy of the user, raising User.DoesNotExist if there is none."""
+        if not self.ttl:
+            return User.objects.get(id=user_id)
+        
+        user = self.local.get(user_id)
+        if user is not None:
+            metrics.increment('auth', 'user_cache', hits=1, local_hits=1)
+            return copy(user)
+        
+        shared = self.shared
+        if shared is not None:
+            user = shared.get(self.get_key(user_id))
+            if user is not None:
+                metrics.increment('auth', 'user_cache', hits=1, shared_hits=1)
+                self.local.set(user_id, user)
+                return copy(user)
+        
+        metrics.increment('auth', 'user_cache', misses=1)
+        user = User.objects.get(id=user_id)
+        self.local.set(user_id, user)
+        if shared is not None:
+            shared.set(self.get_key(user_id), user, self.ttl)
+        return copy(user)
+    
+    def invalidate(self, user_id):
+        """Drop a user from both tiers."""
+        self.local.delete(user_id)
+        shared = self.shared
+        if shared is not None:
+            shared.delete(self.get_key(user_id))
+
+
+user_cache = UserCache()
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified JWT payloads keyed by a SHA-256 of the raw token.
+
+    A cached payload is served until the token's ``exp`` and never after it,
+    so repeat requests skip signature verification and claim validation.
+    JWT_TOKEN_CACHE_SIZE caps the number of entries (0 disables the cache).
+    """
+    
+    def __init__(self):
+        self._local = None
+    
+    @property
+    def local(self):
+        if self._local is None:
+            self._local = LRUCache(max_size=getattr(settings, 'JWT_TOKEN_CACHE_SIZE', 10000))
+        return self._local
+    
+    def decode(self, token):
+        """Return the verified payload of a token, raising jwt.InvalidTokenError subclasses."""
+        if not getattr(settings, 'JWT_TOKEN_CACHE_SIZE', 10000):
+            return self.verify(token)
+        
+        key = hashlib.sha256(token.encode('utf-8')).digest()
+        payload = self.local.get(key)
+        if payload is not None:
+            metrics.increment('auth', 'token_cache', hits=1)
+            return payload
+        
+        metrics.increment('auth', 'token_cache', misses=1)
+        payload = self.verify(token)
+        # Tokens without an expiry are never cached
+        if isinstance(payload.get('exp'), (int, float)):
+            self.local.set(key, payload, expires_at=payload['exp'])
+        return payload
+    
+    def verify(self, token):
+        return jwt.decode(
+            token,
+            settings.JWT_SECRET_KEY,
+            algorithms=[settings.JWT_ALGORITHM]
+        )
+
+
+token_cache = TokenCache()
+
+
+class RevocationList:
+    """
+    Revoked token IDs (``jti``) with an in-process Bloom filter in front of the DB.
+
+    The RevokedToken table is the source of truth. Every process keeps a Bloom
+    filter of the unexpired revoked IDs, so checking a token that was never
+    revoked costs no query. Only filter positives (revoked tokens and rare false
+    positives) are confirmed against the table. Revocations made in other
+    processes are picked up by an incremental sync at most every
+    JWT_REVOCATION_SYNC_INTERVAL seconds.
+    """
+    
+    # Re-read rows revoked slightly before the last sync to tolerate clock skew
+    # and late commits between processes; re-adding a key does not count
+    # towards the filter's capacity
+    sync_overlap = 60
+    
+    def __init__(self):
+        self._filter = None
+        self._synced_at = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def capacity(self):
+        return getattr(settings, 'JWT_REVOCATION_FILTER_CAPACITY', 100000)
+    
+    def is_revoked(self, jti):
+        """Return True if the token ID has been revoked."""
+        self.sync_if_due()
+        if jti not in self._filter:
+            metrics.increment('auth', 'revocation', checks=1)
+            return False
+        
+        metrics.increment('auth', 'revocation', checks=1, filter_positives=1)
+        return RevokedToken.objects.filter(jti=jti).exists()
+    
+    def revoke(self, payload):
+        """
+        Record a verified token payload as revoked.
+        
+        Returns False if the token was already revoked, which lets refresh token
+        rotation detect a token being used twice.
+        """
+        expires_at = datetime.fromtimestamp(payload['exp'], tz=dt_timezone.utc)
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=payload['jti'], user_id=payload['user_id'], expires_at=expires_at)
+        except IntegrityError:
+            return False
+        
+        self.sync_if_due()
+        self._filter.add(payload['jti'])
+        return True
+    
+    def sync_if_due(self):
+        now = time.time()
+        if self._filter is not None and now - self._synced_at < getattr(settings, 'JWT_REVOCATION_SYNC_INTERVAL', 5):
+            return
+        with self._lock:
+            if self._filter is not None and now - self._synced_at < getattr(settings, 'JWT_REVOCATION_SYNC_INTERVAL', 5):
+                return
+            self.sync(now)
+    
+    def sync(self, now):
+        """Add tokens revoked since the last sync, rebuilding the filter when it is full."""
+        if self._filter is None or self._filter.count >= self._filter.capacity:
+            self.rebuild(now)
+            return
+        
+        since = datetime.fromtimestamp(self._synced_at - self.sync_overlap, tz=dt_timezone.utc)
+        for jti in RevokedToken.objects.filter(revoked_at__gte=since).values_list('jti', flat=True):
+            self._filter.add(jti)
+        self._synced_at = now
+    
+    def rebuild(self, now):
+        """Build a fresh filter from the unexpired revoked tokens."""
+        active = RevokedToken.objects.filter(expires_at__gt=datetime.fromtimestamp(now, tz=dt_timezone.utc))
+        jtis = list(active.values_list('jti', flat=True))
+        bloom = BloomFilter(
+            capacity=max(self.capacity, 2 * len(jtis)),
+            error_rate=getattr(settings, 'JWT_REVOCATION_FILTER_ERROR_RATE', 0.001)
+        )
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter = bloom
+        self._synced_at = now
+
+
+revocation_list = RevocationList()
+
+
+def _encode_token(user, token_type, lifetime):
     payload = {
         'user_id': user.id,
         'email': user.email,
-        'exp': datetime.utcnow() + timedelta(seconds=settings.JWT_EXPIRATION_DELTA),
+        'type': token_type,
+        'jti': uuid.uuid4().hex,
+        'exp': datetime.utcnow() + timedelta(seconds=lifetime),
         'iat': datetime.utcnow()
     }
     
-    token = jwt.encode(
+    return jwt.encode(
         payload,
         settings.JWT_SECRET_KEY,
         algorithm=settings.JWT_ALGORITHM
     )
+
+
+def generate_jwt_token(user):
+    """Generate a short-lived JWT access token for a user."""
+    return _encode_token(user, 'access', settings.JWT_EXPIRATION_DELTA)
+
+
+def generate_refresh_token(user):
+    """Generate a JWT refresh token for a user, exchanged once at /auth/refresh/."""
+    return _encode_token(user, 'refresh', settings.JWT_REFRESH_EXPIRATION_DELTA)
+
+
+def decode_refresh_token(token):
+    """Verify a refresh token and return its payload, raising AuthenticationFailed."""
+    try:
+        payload = token_cache.verify(token)
+    except jwt.ExpiredSignatureError:
+        raise exceptions.AuthenticationFailed('Refresh token has expired.')
+    except jwt.InvalidTokenError:
+        raise exceptions.AuthenticationFailed('Invalid refresh token.')
     
-    return token
+    if payload.get('type') != 'refresh' or 'jti' not in payload:
+        raise exceptions.AuthenticationFailed('Invalid refresh token.')
+    return payload
 
 
 class JWTAuthentication(authentication.BaseAuthentication):
@@ -51,18 +294,26 @@ class JWTAuthentication(authentication.BaseAuthentication):
     def _authenticate_credentials(self, token):
         """Decode and validate the token, returning the user."""
         try:
-            payload = jwt.decode(
-                token,
-                settings.JWT_SECRET_KEY,
-                algorithms=[settings.JWT_ALGORITHM]
-            )
+            payload = token_cache.decode(token)
         except jwt.ExpiredSignatureError:
             raise exceptions.AuthenticationFailed('Token has expired.')
         except jwt.InvalidTokenError:
             raise exceptions.AuthenticationFailed('Invalid token.')
         
+        # Refresh tokens are only accepted by /auth/refresh/
+        if payload.get('type', 'access') != 'access':
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        
+        # Checked on every request, including payloads served from the token cache.
+        # Tokens issued before revocation support carry no jti and simply expire.
+        if 'jti' in payload and revocation_list.is_revoked(payload['jti']):
+            raise exceptions.AuthenticationFailed('Token has been revoked.')
+        
+        # Users who just wrote read their own changes from the primary
+        use_primary_if_pinned(payload['user_id'])
+        
         try:
-            user = User.objects.get(id=payload['user_id'])
+            user = user_cache.get(payload['user_id'])
         except User.DoesNotExist:
             raise exceptions.AuthenticationFailed('User not found.')
         
@@ -0,0 +1,88 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+
+from .models import User
+
+
+class LoginCapacityExceeded(Exception):
+    """Raised when too many logins are already waiting for a password hash."""
+
+
+class PasswordHashPool:
+    """
+    Bounded worker pool for password hashing.
+
+    At most LOGIN_HASH_WORKERS hashes run at once and at most
+    LOGIN_HASH_MAX_PENDING logins may be running or queued. A login that finds
+    no free slot raises LoginCapacityExceeded right away instead of tying up a
+    request thread behind a login storm; a login holding a slot waits at most
+    for the hashes queued ahead of it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+
+    def setup(self):
+        with self._lock:
+            if self._executor is None:
+                self._slots = threading.BoundedSemaphore(getattr(settings, 'LOGIN_HASH_MAX_PENDING', 32))
+                self._executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'LOGIN_HASH_WORKERS', 4),
+                    thread_name_prefix='password-hash'
+                )
+
+    def run(self, function, *args):
+        """Run a hashing function in the pool and return its result."""
+        if self._executor is None:
+            self.setup()
+
+        if not self._slots.acquire(blocking=False):
+            raise LoginCapacityExceeded()
+        try:
+            return self._executor.submit(function, *args).result()
+        finally:
+            self._slots.release()
+
+
+password_hash_pool = PasswordHashPool()
+
+
+class EmailOrUsernameBackend(ModelBackend):
+    """
+    Authenticate with an email address or a username (nickname) in one query.
+
+    Password hashing runs in the bounded password hash pool. Unknown users still
+    pay for one hash so failed lookups take as long as wrong passwords.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        # Input containing '@' is an email, anything else a username
+        lookup = 'email' if '@' in username else 'username'
+        try:
+            user = User.objects.get(**{lookup: username})
+        except User.DoesNotExist:
+            password_hash_pool.run(make_password, password)
+            return None
+
+        needs_rehash = []
+        is_correct = password_hash_pool.run(
+            check_password, password, user.password, lambda raw_password: needs_rehash.append(True)
+        )
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+
+        # Upgrade outdated hashes in the request thread, which owns the DB connection
+        if needs_rehash:
+            user.set_password(password)
+            user.save(update_fields=['password'])
+        return user
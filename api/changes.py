@@ -0,0 +1,63 @@
+from django.db import transaction
+
+from .models import ChangeLog, User
+
+
+def lock_user_changes(user_id):
+    """
+    Serialize change log writes of one user until the transaction commits.
+
+    Without the lock a change with a lower ID could commit after a client has
+    already synced past a higher one and would never be delivered.
+    """
+    User.objects.select_for_update().filter(id=user_id).values_list('id').first()
+
+
+def record_change(instance, action):
+    """Replace the change log entry of an exercise or training."""
+    record_changes([instance], action)
+
+
+def record_changes(instances, action):
+    """Replace the change log entries of several objects of one model and user."""
+    if not instances:
+        return
+    record_object_changes(
+        instances[0].user_id,
+        instances[0]._meta.model_name,
+        [instance.pk for instance in instances],
+        action
+    )
+
+
+def record_object_changes(user_id, model, object_ids, action):
+    """Replace the change log entries of objects of one model and user given by ID."""
+    if not object_ids:
+        return
+
+    with transaction.atomic():
+        lock_user_changes(user_id)
+        ChangeLog.objects.filter(model=model, object_id__in=object_ids).delete()
+        ChangeLog.objects.bulk_create([
+            ChangeLog(user_id=user_id, model=model, object_id=object_id, action=action)
+            for object_id in object_ids
+        ])
+
+
+def read_changes(user, cursor, limit):
+    """
+    Return up to ``limit`` change log entries of a user after ``cursor``.
+
+    Returns (entries, next cursor, has more) where entries are
+    (id, model, object_id, action) tuples in change order.
+    """
+    entries = list(
+        ChangeLog.objects
+        .filter(user=user, id__gt=cursor)
+        .order_by('id')
+        .values_list('id', 'model', 'object_id', 'action')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    next_cursor = entries[-1][0] if entries else cursor
+    return entries, next_cursor, has_more
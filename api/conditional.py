@@ -0,0 +1,93 @@
+from functools import wraps
+from django.db import IntegrityError, router, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import condition
+
+from .models import UserDataVersion
+
+
+def bump_data_version(user_id):
+    """
+    Increment the data version of a user after one of their rows changed.
+
+    Rows are only created on read, so users who never fetched an ETag (and
+    users being deleted) cost a no-op UPDATE.
+    """
+    bump_data_versions([user_id])
+
+
+def bump_data_versions(user_ids):
+    """Increment the data version of several users with a single UPDATE."""
+    UserDataVersion.objects.filter(user_id__in=user_ids).update(
+        version=F('version') + 1,
+        updated_at=timezone.now()
+    )
+
+
+def get_data_version(request):
+    """Return the (version, updated_at) of the requesting user, looked up once per request."""
+    if not hasattr(request, '_data_version'):
+        data_version = (
+            UserDataVersion.objects
+            .filter(user_id=request.user.id)
+            .values_list('version', 'updated_at')
+            .first()
+        )
+        if data_version is None:
+            try:
+                with transaction.atomic():
+                    created = UserDataVersion.objects.create(user_id=request.user.id, updated_at=timezone.now())
+                data_version = (created.version, created.updated_at)
+            except IntegrityError:
+                # A concurrent request created the row first; replicas may not have it yet
+                data_version = (
+                    UserDataVersion.objects
+                    .using(router.db_for_write(UserDataVersion))
+                    .filter(user_id=request.user.id)
+                    .values_list('version', 'updated_at')
+                    .get()
+                )
+        request._data_version = data_version
+    return request._data_version
+
+
+def data_version_etag(request, *args, **kwargs):
+    """Build a weak ETag from the user's data version."""
+    version, _ = get_data_version(request)
+    etag = f'{request.user.id}-{version}'
+
+    # Relative periods move with the clock, so pin them to the current minute
+    if request.GET.get('period'):
+        etag += f'-{int(timezone.now().timestamp() // 60)}'
+    return f'W/"{etag}"'
+
+
+def data_version_last_modified(request, *args, **kwargs):
+    """Return the time of the user's last write, unless the response depends on the clock."""
+    if request.GET.get('period'):
+        return None
+    _, updated_at = get_data_version(request)
+    return updated_at
+
+
+def conditional_on_data_version(view_method):
+    """
+    Answer conditional GETs for a per-user read action from the data version.
+
+    A matching If-None-Match or If-Modified-Since returns 304 after a single
+    primary-key lookup, without running the queryset or the serializers.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        view = condition(
+            etag_func=data_version_etag,
+            last_modified_func=data_version_last_modified
+        )(lambda request, *args, **kwargs: view_method(self, request, *args, **kwargs))
+
+        response = view(request, *args, **kwargs)
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+    return wrapper
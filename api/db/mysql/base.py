@@ -0,0 +1,12 @@
+from django.db.backends.mysql import base
+
+from ..pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """MySQL backend serving connections from a per-process pool (ENGINE 'api.db.mysql')."""
+
+    @staticmethod
+    def ping_connection(connection):
+        # Never reconnect silently: a new session would lack the init state
+        connection.ping(reconnect=False)
@@ -0,0 +1,252 @@
+import os
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """No pooled connection became available within the checkout timeout."""
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of DB-API connections for one database alias.
+
+    At most ``max_size`` connections exist at a time, in use or idle; a
+    checkout beyond that waits up to ``timeout`` seconds for a release and then
+    raises PoolTimeout. Idle connections are handed out most recently used
+    first. Connections older than ``max_lifetime`` seconds are closed instead
+    of reused, and connections idle for ``check_after`` seconds or more are
+    pinged on checkout and replaced when the ping fails.
+    """
+
+    def __init__(self, connect, ping, max_size=10, timeout=10, max_lifetime=1800, check_after=5):
+        self.connect = connect
+        self.ping = ping
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self.pid = os.getpid()
+
+        self._idle = deque()  # (connection, created_at, released_at)
+        self._checked_out = {}  # id(connection) -> created_at
+        self._size = 0
+        self._condition = threading.Condition()
+        self._counters = {
+            'checkouts': 0,
+            'reused': 0,
+            'created': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'expired': 0,
+            'unhealthy': 0,
+            'discarded': 0,
+        }
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def acquire(self):
+        """Check out a connection; returns (connection, reused)."""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        with self._condition:
+            while True:
+                if self._idle:
+                    connection, created_at, released_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    # Reserve a slot and open the connection outside the lock
+                    self._size += 1
+                    connection = created_at = released_at = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolTimeout(f'No database connection available within {self.timeout} seconds')
+                waited = True
+                self._condition.wait(remaining)
+
+            wait_time = time.monotonic() - start
+            self._counters['checkouts'] += 1
+            if waited:
+                self._counters['waits'] += 1
+            self._wait_time_total += wait_time
+            self._wait_time_max = max(self._wait_time_max, wait_time)
+
+        if connection is not None:
+            now = time.monotonic()
+            if now - created_at >= self.max_lifetime:
+                self._close(connection, 'expired')
+            elif now - released_at >= self.check_after and not self._is_healthy(connection):
+                self._close(connection, 'unhealthy')
+            else:
+                with self._condition:
+                    self._checked_out[id(connection)] = created_at
+                    self._counters['reused'] += 1
+                return connection, True
+
+        try:
+            connection = self.connect()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._checked_out[id(connection)] = time.monotonic()
+            self._counters['created'] += 1
+        return connection, False
+
+    def release(self, connection, discard=False):
+        """Return a connection to the pool, or close it when ``discard`` is set or it expired."""
+        with self._condition:
+            created_at = self._checked_out.pop(id(connection), None)
+        if created_at is None:
+            # Not checked out from this pool (e.g. opened before a fork)
+            self._close(connection, None)
+            return
+
+        if discard or time.monotonic() - created_at >= self.max_lifetime:
+            self._close(connection, 'discarded' if discard else 'expired')
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            return
+
+        with self._condition:
+            self._idle.append((connection, created_at, time.monotonic()))
+            self._condition.notify()
+
+    def close_idle(self):
+        """Close every idle connection, e.g. before shutting a worker down."""
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for connection, _, _ in idle:
+            self._close(connection, None)
+
+    def stats(self):
+        """Return the current pool usage and cumulative checkout counters."""
+        with self._condition:
+            checkouts = self._counters['checkouts']
+            return {
+                'max_size': self.max_size,
+                'in_use': len(self._checked_out),
+                'idle': len(self._idle),
+                **self._counters,
+                'wait_time_total': round(self._wait_time_total, 6),
+                'wait_time_avg': round(self._wait_time_total / checkouts, 6) if checkouts else 0.0,
+                'wait_time_max': round(self._wait_time_max, 6),
+            }
+
+    def _is_healthy(self, connection):
+        try:
+            self.ping(connection)
+        except Exception:
+            return False
+        return True
+
+    def _close(self, connection, reason):
+        if reason is not None:
+            with self._condition:
+                self._counters[reason] += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, options, connect, ping):
+    """
+    Return the pool of a database alias in this process, creating it on first use.
+
+    ``options`` is the ``POOL`` entry of the alias in DATABASES. A process
+    forked after the pool was created gets a fresh one, so connections are
+    never shared between processes.
+    """
+    pool = _pools.get(alias)
+    if pool is None or pool.pid != os.getpid():
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None or pool.pid != os.getpid():
+                pool = ConnectionPool(
+                    connect,
+                    ping,
+                    max_size=options.get('MAX_SIZE', 10),
+                    timeout=options.get('TIMEOUT', 10),
+                    max_lifetime=options.get('MAX_LIFETIME', 1800),
+                    check_after=options.get('CHECK_AFTER', 5),
+                )
+                _pools[alias] = pool
+    return pool
+
+
+def get_pool_stats():
+    """Return the stats of every connection pool of this process by alias."""
+    return {alias: pool.stats() for alias, pool in list(_pools.items()) if pool.pid == os.getpid()}
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Take connections from a per-process ConnectionPool instead of opening one per request.
+
+    Mixed into a backend's DatabaseWrapper. Django still "closes" the
+    connection at the end of every request (keep ``CONN_MAX_AGE`` at 0); the
+    close hands it back to the pool instead, unless it is inside a
+    transaction, saw an error or had autocommit changed, in which case it is
+    discarded. Backends with a cheaper liveness check than a ``SELECT 1``
+    round trip override ``ping_connection``.
+    """
+
+    connection_reused = False
+
+    @staticmethod
+    def ping_connection(connection):
+        """Raise if a raw DB-API connection is no longer usable."""
+        cursor = connection.cursor()
+        try:
+            cursor.execute('SELECT 1')
+        finally:
+            cursor.close()
+
+    def get_connection_pool(self, conn_params):
+        return get_pool(
+            self.alias,
+            self.settings_dict.get('POOL', {}),
+            lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(conn_params),
+            self.ping_connection
+        )
+
+    def get_new_connection(self, conn_params):
+        try:
+            connection, self.connection_reused = self.get_connection_pool(conn_params).acquire()
+        except PoolTimeout as exc:
+            raise self.Database.OperationalError(str(exc))
+        return connection
+
+    def init_connection_state(self):
+        # Session settings made on checkout survive on a reused connection
+        if not self.connection_reused:
+            super().init_connection_state()
+
+    def _close(self):
+        if self.connection is None:
+            return
+        discard = (
+            self.in_atomic_block
+            or self.errors_occurred
+            or self.autocommit != self.settings_dict['AUTOCOMMIT']
+        )
+        pool = _pools.get(self.alias)
+        if pool is None or pool.pid != os.getpid():
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.release(self.connection, discard=discard)
@@ -0,0 +1,116 @@
+import contextvars
+import math
+import random
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .. import metrics
+from ..caching import LRUCache
+
+
+# Replica the reads of the current request go to, or None for the primary
+_read_alias = contextvars.ContextVar('read_alias', default=None)
+
+_local_pins = LRUCache(max_size=100000)
+
+
+def get_replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def start_request(safe):
+    """
+    Pick the replica for the reads of a request; returns a token for end_request.
+
+    One replica serves the whole request so all of its reads see the same
+    point of the replication stream. Unsafe requests read from the primary.
+    """
+    replicas = get_replicas()
+    return _read_alias.set(random.choice(replicas) if safe and replicas else None)
+
+
+def end_request(token):
+    _read_alias.reset(token)
+
+
+def get_read_alias():
+    return _read_alias.get()
+
+
+def iterate_with_read_alias(content, alias):
+    """
+    Iterate streamed response content with the reads of each chunk routed to ``alias``.
+
+    Streaming content is consumed after the middleware has ended the request,
+    so the alias is set around every chunk instead of held for the stream.
+    """
+    iterator = iter(content)
+    while True:
+        token = _read_alias.set(alias)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _read_alias.reset(token)
+        yield chunk
+
+
+def pin_user(user_id):
+    """Send a user's reads to the primary for REPLICA_PIN_SECONDS after one of their writes."""
+    duration = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+    until = time.time() + duration
+    alias = getattr(settings, 'REPLICA_PIN_CACHE_ALIAS', None)
+    if alias:
+        # The stored deadline decides; some backends round the cache expiry down
+        caches[alias].set(f'replica-pin:{user_id}', until, math.ceil(duration) + 1)
+    else:
+        _local_pins.set(user_id, until, expires_at=until)
+
+
+def is_pinned(user_id):
+    alias = getattr(settings, 'REPLICA_PIN_CACHE_ALIAS', None)
+    until = caches[alias].get(f'replica-pin:{user_id}') if alias else _local_pins.get(user_id)
+    return until is not None and until > time.time()
+
+
+def use_primary_if_pinned(user_id):
+    """Move the rest of the current request to the primary if the user wrote recently."""
+    if _read_alias.get() is None or not is_pinned(user_id):
+        return False
+    _read_alias.set(None)
+    metrics.increment('db_router', 'requests', pinned=1)
+    return True
+
+
+class ReplicaRouter:
+    """
+    Send the reads of safe requests to a replica and everything else to the primary.
+
+    The replica of a request is chosen by ReplicaRoutingMiddleware. Reads fall
+    back to the primary outside requests, inside a transaction on the primary,
+    for users pinned after a recent write, and for models that must never be
+    read stale (revocations, idempotency keys, sessions and the database
+    cache holding the pins).
+    """
+
+    primary_only = {'api.revokedtoken', 'api.idempotencykey', 'sessions.session', 'django_cache.cacheentry'}
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        # The database cache's stand-in model has no label_lower
+        label = f'{model._meta.app_label}.{model._meta.model_name}'
+        if alias is None or label in self.primary_only:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
@@ -0,0 +1,12 @@
+from django.db.backends.sqlite3 import base
+
+from ..pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    SQLite backend serving connections from a per-process pool (ENGINE 'api.db.sqlite3').
+
+    Local stand-in for the pooled MySQL backend in development and checks; use
+    a file database, since every in-memory connection is a separate database.
+    """
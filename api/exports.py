@@ -0,0 +1,73 @@
+import csv
+import json
+from django.db.models import F
+from rest_framework import serializers
+
+from .muscles import muscle_registry
+from .pagination import iterate_keyset, merge_ordered
+
+
+EXPORT_FIELDS = ['id', 'exercise', 'exercise_name', 'muscle_name', 'weight', 'sets', 'repetitions', 'datetime']
+
+EXPORT_ORDERING = ('-datetime', '-id')
+
+# Reuse DRF field formatting so exported values match the API output
+WEIGHT_FIELD = serializers.DecimalField(max_digits=6, decimal_places=2)
+DATETIME_FIELD = serializers.DateTimeField()
+
+
+class Echo:
+    """Pseudo-buffer that hands csv.writer output straight back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def iterate_training_rows(querysets, batch_size=2000):
+    """
+    Yield the training log of one or more querysets (e.g. hot and archived
+    trainings) as flat dicts in export order, one keyset batch at a time.
+    """
+    batches = [
+        iterate_keyset(
+            queryset.values(
+                'id',
+                'exercise_id',
+                'weight',
+                'sets',
+                'repetitions',
+                'datetime',
+                exercise_name=F('exercise__name'),
+                muscle_id=F('exercise__muscle_id')
+            ),
+            EXPORT_ORDERING,
+            batch_size
+        )
+        for queryset in querysets
+    ]
+
+    for row in merge_ordered(batches, EXPORT_ORDERING):
+        yield {
+            'id': row['id'],
+            'exercise': row['exercise_id'],
+            'exercise_name': row['exercise_name'],
+            'muscle_name': muscle_registry.get_name(row['muscle_id']),
+            'weight': WEIGHT_FIELD.to_representation(row['weight']),
+            'sets': row['sets'],
+            'repetitions': row['repetitions'],
+            'datetime': DATETIME_FIELD.to_representation(row['datetime']),
+        }
+
+
+def stream_ndjson(rows):
+    """Encode rows as newline-delimited JSON, one line per row."""
+    for row in rows:
+        yield json.dumps(row) + '\n'
+
+
+def stream_csv(rows):
+    """Encode rows as CSV with a header line."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
@@ -0,0 +1,133 @@
+import decimal
+from django.utils import timezone
+
+from .muscles import muscle_registry
+
+
+def decimal_converter(max_digits, decimal_places):
+    """Format Decimals exactly like DRF's DecimalField with COERCE_DECIMAL_TO_STRING."""
+    context = decimal.getcontext().copy()
+    context.prec = max_digits
+    exponent = decimal.Decimal('.1') ** decimal_places
+
+    def convert(value):
+        if value is None:
+            return None
+        return '{:f}'.format(value.quantize(exponent, context=context))
+
+    return convert
+
+
+def datetime_converter():
+    """Format datetimes exactly like DRF's ISO 8601 DateTimeField in the current timezone."""
+    current_timezone = timezone.get_current_timezone()
+
+    def convert(value):
+        if not value:
+            return None
+        value = value.astimezone(current_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return convert
+
+
+def muscle_name_converter():
+    """Resolve muscle IDs to names from the in-process muscle registry."""
+    names = muscle_registry.get_catalog().names
+
+    def convert(value):
+        name = names.get(value)
+        return name if name is not None or value is None else muscle_registry.get_name(value)
+
+    return convert
+
+
+class FastReadSerializer:
+    """
+    Read-only serializer that maps ``values_list`` rows straight to output dicts.
+
+    ``fields`` is a sequence of (output name, ORM lookup, converter factory or
+    None). Rows are fetched as named tuples so keyset pagination can read the
+    ordering columns, and each value goes through a converter built once per
+    call instead of DRF's per-field machinery. Output must stay identical to the
+    matching ModelSerializer.
+    """
+
+    fields = ()
+
+    @classmethod
+    def get_fields(cls, fields=None):
+        """Return the field specs to output, optionally restricted to ``fields``."""
+        if fields is None:
+            return cls.fields
+        return tuple(spec for spec in cls.fields if spec[0] in fields)
+
+    @classmethod
+    def get_queryset(cls, queryset, fields=None, extra_lookups=()):
+        """
+        Project a model queryset onto the lookups this serializer needs.
+
+        ``extra_lookups`` are fetched after the output columns (e.g. pagination
+        ordering columns) without being serialized.
+        """
+        lookups = cls.get_lookups(cls.get_fields(fields))
+        lookups += [lookup for lookup in extra_lookups if lookup not in lookups]
+        return queryset.values_list(*lookups, named=True)
+
+    @staticmethod
+    def get_lookups(specs):
+        """Return the distinct lookups of ``specs``; several fields may read the same column."""
+        lookups = []
+        for _, lookup, _ in specs:
+            if lookup not in lookups:
+                lookups.append(lookup)
+        return lookups
+
+    @classmethod
+    def serialize(cls, rows, fields=None):
+        """Convert fetched rows into a list of output dicts."""
+        specs = cls.get_fields(fields)
+        names = [name for name, _, _ in specs]
+        converters = [factory() if factory else None for _, _, factory in specs]
+        converted = [(index, converter) for index, converter in enumerate(converters) if converter is not None]
+        lookups = cls.get_lookups(specs)
+        positions = [lookups.index(lookup) for _, lookup, _ in specs]
+
+        data = []
+        for row in rows:
+            values = [row[position] for position in positions]
+            for index, converter in converted:
+                values[index] = converter(values[index])
+            data.append(dict(zip(names, values)))
+        return data
+
+
+class FastTrainingSerializer(FastReadSerializer):
+    """Fast read path matching TrainingSerializer."""
+
+    fields = (
+        ('id', 'id', None),
+        ('exercise', 'exercise_id', None),
+        ('exercise_name', 'exercise__name', None),
+        ('muscle_name', 'exercise__muscle_id', muscle_name_converter),
+        ('weight', 'weight', lambda: decimal_converter(6, 2)),
+        ('sets', 'sets', None),
+        ('repetitions', 'repetitions', None),
+        ('datetime', 'datetime', datetime_converter),
+    )
+
+
+class FastExerciseSerializer(FastReadSerializer):
+    """Fast read path matching ExerciseSerializer."""
+
+    fields = (
+        ('id', 'id', None),
+        ('muscle', 'muscle_id', None),
+        ('muscle_name', 'muscle_id', muscle_name_converter),
+        ('name', 'name', None),
+        ('note', 'note', None),
+        ('created_at', 'created_at', datetime_converter),
+        ('updated_at', 'updated_at', datetime_converter),
+    )
@@ -0,0 +1,53 @@
+from datetime import timedelta
+from django.utils import timezone
+
+
+PERIOD_CHOICES = ['current_week', 'last_week', 'last_month', 'last_year']
+
+
+def get_period_bounds(period, now=None):
+    """
+    Return the (start, end) datetimes covered by a history period.
+
+    ``end`` is None for periods that run up to now. Unknown or empty periods
+    return None so callers can skip filtering.
+    """
+    if now is None:
+        now = timezone.now()
+
+    if period == 'current_week':
+        # Get current week (Monday to Sunday)
+        start_of_week = now - timedelta(days=now.weekday())
+        start_date = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
+        return start_date, None
+
+    if period == 'last_week':
+        # Get last week (Monday to Sunday)
+        start_of_current_week = now - timedelta(days=now.weekday())
+        end_of_last_week = start_of_current_week - timedelta(seconds=1)
+        start_of_last_week = end_of_last_week - timedelta(days=6)
+        start_of_last_week = start_of_last_week.replace(hour=0, minute=0, second=0, microsecond=0)
+        return start_of_last_week, end_of_last_week
+
+    if period == 'last_month':
+        # Get last 30 days
+        return now - timedelta(days=30), None
+
+    if period == 'last_year':
+        # Get last 365 days
+        return now - timedelta(days=365), None
+
+    return None
+
+
+def filter_by_period(queryset, period, field='datetime'):
+    """Restrict a queryset to the rows whose ``field`` falls inside a history period."""
+    bounds = get_period_bounds(period)
+    if bounds is None:
+        return queryset
+
+    start, end = bounds
+    queryset = queryset.filter(**{f'{field}__gte': start})
+    if end is not None:
+        queryset = queryset.filter(**{f'{field}__lte': end})
+    return queryset
@@ -0,0 +1,144 @@
+import hashlib
+import time
+from datetime import timedelta
+from functools import wraps
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+
+HEADER = 'Idempotency-Key'
+
+
+def get_owner(request):
+    if request.user and request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return 'anonymous'
+
+
+def get_fingerprint(request):
+    """Hash the method, path and body so a key cannot be reused for another request."""
+    digest = hashlib.sha256(f'{request.method} {request.path}\n'.encode('utf-8'))
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def claim(owner, key, fingerprint):
+    """
+    Insert an in-progress record for the key.
+
+    Returns None when the claim succeeded, otherwise the existing record.
+    Expired records and in-progress records older than
+    IDEMPOTENCY_LOCK_TIMEOUT (left behind by a crashed worker) are replaced.
+    """
+    now = timezone.now()
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(
+                    owner=owner,
+                    key=key,
+                    fingerprint=fingerprint,
+                    expires_at=now + timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_TTL', 86400))
+                )
+            return None
+        except IntegrityError:
+            record = IdempotencyKey.objects.filter(owner=owner, key=key).first()
+            if record is None:
+                continue
+
+            lock_timeout = timedelta(seconds=getattr(settings, 'IDEMPOTENCY_LOCK_TIMEOUT', 60))
+            abandoned = record.status_code is None and record.created_at <= now - lock_timeout
+            if record.expires_at > now and not abandoned:
+                return record
+            IdempotencyKey.objects.filter(pk=record.pk, created_at=record.created_at).delete()
+    return IdempotencyKey.objects.get(owner=owner, key=key)
+
+
+def wait_for_completion(record):
+    """Poll an in-progress record for up to IDEMPOTENCY_WAIT_TIMEOUT seconds."""
+    deadline = time.monotonic() + getattr(settings, 'IDEMPOTENCY_WAIT_TIMEOUT', 5)
+    while record is not None and record.status_code is None and time.monotonic() < deadline:
+        time.sleep(0.1)
+        record = IdempotencyKey.objects.filter(pk=record.pk).first()
+    return record
+
+
+def replay(record):
+    response = HttpResponse(bytes(record.body), status=record.status_code, content_type=record.content_type)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view_method):
+    """
+    Make a POST handler safe to retry with an ``Idempotency-Key`` header.
+
+    The first completed response (any status below 500) is stored for
+    IDEMPOTENCY_KEY_TTL seconds and replayed byte for byte on retries with the
+    same key, without running the view again. A concurrent duplicate waits for
+    the in-flight request and replays its response, or gets 409 if it does not
+    finish in time. Reusing a key for a different request returns 422.
+    Requests without the header are not affected.
+    """
+    @wraps(view_method)
+    def wrapper(*args, **kwargs):
+        request = next(arg for arg in args if isinstance(arg, Request))
+        key = request.headers.get(HEADER)
+        if not key:
+            return view_method(*args, **kwargs)
+
+        if len(key) > 255:
+            return Response({'error': f'{HEADER} must be at most 255 characters.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        owner = get_owner(request)
+        fingerprint = get_fingerprint(request)
+        record = claim(owner, key, fingerprint)
+
+        if record is not None:
+            if record.fingerprint != fingerprint:
+                return Response({
+                    'error': f'{HEADER} was already used for a different request.'
+                }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+            record = wait_for_completion(record)
+            if record is not None and record.status_code is not None:
+                return replay(record)
+            return Response({
+                'error': f'A request with this {HEADER} is still in progress.'
+            }, status=status.HTTP_409_CONFLICT, headers={'Retry-After': '1'})
+
+        view = request.parser_context['view']
+        try:
+            response = view_method(*args, **kwargs)
+        except APIException as exc:
+            # Validation and permission errors are outcomes worth replaying too
+            response = view.handle_exception(exc)
+        except Exception:
+            IdempotencyKey.objects.filter(owner=owner, key=key).delete()
+            raise
+
+        if response.status_code >= 500:
+            IdempotencyKey.objects.filter(owner=owner, key=key).delete()
+            return response
+
+        # Render now so the exact bytes can be stored; DRF leaves a rendered
+        # response as it is
+        context = request.parser_context
+        response = view.finalize_response(request, response, *context['args'], **context['kwargs'])
+        response.render()
+        IdempotencyKey.objects.filter(owner=owner, key=key).update(
+            status_code=response.status_code,
+            content_type=response.get('Content-Type', ''),
+            body=response.content
+        )
+        return response
+
+    return wrapper
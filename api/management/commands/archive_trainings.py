@@ -0,0 +1,63 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from api.archive import move_to_archive
+from api.models import Training
+
+
+class Command(BaseCommand):
+    help = 'Move trainings older than the archive horizon from the training table into training_archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=getattr(settings, 'TRAINING_ARCHIVE_AFTER_DAYS', 400),
+            help='Archive trainings older than this many days'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of trainings to move per transaction'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Seconds to sleep between batches to limit the load on the database'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the trainings that would be archived'
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] <= 0:
+            raise CommandError('--days must be greater than 0')
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size must be greater than 0')
+
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        if options['dry_run']:
+            count = Training.objects.filter(datetime__lt=cutoff).count()
+            self.stdout.write(f'{count} training(s) older than {cutoff:%Y-%m-%d} would be archived')
+            return
+
+        archived_count = 0
+        last_id = 0
+        while True:
+            moved, last_id = move_to_archive(cutoff, after_id=last_id, batch_size=options['batch_size'])
+            if not moved:
+                break
+            archived_count += moved
+            self.stdout.write(f'Archived trainings up to ID {last_id}')
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully archived {archived_count} training(s) older than {cutoff:%Y-%m-%d}')
+        )
@@ -0,0 +1,92 @@
+import io
+import time
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from api import renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        'Micro-benchmark the fast JSON renderer and parser against DRF on a '
+        'synthetic training history payload and verify identical output'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=10000,
+            help='Number of history rows in the payload'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of timed runs per path (best run is reported)'
+        )
+
+    def handle(self, *args, **options):
+        backend = 'orjson' if renderers.orjson is not None else 'stdlib fallback'
+        self.stdout.write(f'Fast JSON backend: {backend}')
+
+        serialized, raw = self.build_payloads(options['rows'])
+        repeat = options['repeat']
+
+        for label, payload in [('serialized history', serialized), ('raw Decimal/datetime history', raw)]:
+            drf_time, drf_output = self.best_of(lambda: JSONRenderer().render(payload), repeat)
+            fast_time, fast_output = self.best_of(lambda: FastJSONRenderer().render(payload), repeat)
+            if drf_output != fast_output:
+                raise CommandError(f'{label}: FastJSONRenderer output differs from JSONRenderer')
+            self.report(f'render {label}', drf_time, fast_time)
+
+        body = JSONRenderer().render(serialized)
+        drf_time, drf_data = self.best_of(lambda: JSONParser().parse(io.BytesIO(body)), repeat)
+        fast_time, fast_data = self.best_of(lambda: FastJSONParser().parse(io.BytesIO(body)), repeat)
+        if drf_data != fast_data:
+            raise CommandError('FastJSONParser output differs from JSONParser')
+        self.report('parse serialized history', drf_time, fast_time)
+
+    def build_payloads(self, rows):
+        """Build a TrainingSerializer-shaped payload, pre-serialized and with raw values."""
+        now = timezone.now()
+        raw = [
+            {
+                'id': index,
+                'exercise': index % 45,
+                'exercise_name': f'Exercise {index % 45}',
+                'muscle_name': 'chest',
+                'weight': Decimal(1000 + index % 9000) / 100,
+                'sets': 3,
+                'repetitions': 10,
+                'datetime': now - timedelta(minutes=index * 37),
+            }
+            for index in range(rows)
+        ]
+        serialized = [
+            dict(row, weight='{:f}'.format(row['weight']), datetime=row['datetime'].isoformat().replace('+00:00', 'Z'))
+            for row in raw
+        ]
+        return serialized, raw
+
+    def report(self, label, drf_time, fast_time):
+        self.stdout.write(
+            f'{label}: DRF {drf_time * 1000:.1f} ms, fast {fast_time * 1000:.1f} ms, '
+            + self.style.SUCCESS(f'{drf_time / fast_time:.1f}x faster')
+        )
+
+    def best_of(self, function, repeat):
+        """Return the fastest wall time of several runs and the last output."""
+        best = None
+        output = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
@@ -0,0 +1,76 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from api.fast_serializers import FastExerciseSerializer, FastTrainingSerializer
+from api.management.seed import seed_user
+from api.models import Exercise, Training
+from api.serializers import ExerciseSerializer, TrainingSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the DRF serializers with the values_list fast read path on a '
+        'throwaway dataset and verify both produce identical JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--trainings',
+            type=int,
+            default=10000,
+            help='Number of trainings to seed'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Number of timed runs per path (best run is reported)'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = seed_user('serializer-benchmark', options['trainings'], exercises_per_muscle=20)
+
+            trainings = Training.objects.filter(user=user).select_related('exercise')
+            exercises = Exercise.objects.filter(user=user)
+
+            self.compare('history', trainings, TrainingSerializer, FastTrainingSerializer, options['repeat'])
+            self.compare('exercise list', exercises, ExerciseSerializer, FastExerciseSerializer, options['repeat'])
+
+            # Never keep the seeded dataset
+            transaction.set_rollback(True)
+
+    def compare(self, label, queryset, serializer_class, fast_serializer_class, repeat):
+        """Time both serialization paths end to end (query, serialize, render)."""
+        renderer = JSONRenderer()
+
+        def drf_path():
+            return renderer.render(serializer_class(queryset.all(), many=True).data)
+
+        def fast_path():
+            rows = fast_serializer_class.get_queryset(queryset.all())
+            return renderer.render(fast_serializer_class.serialize(rows))
+
+        drf_time, drf_output = self.best_of(drf_path, repeat)
+        fast_time, fast_output = self.best_of(fast_path, repeat)
+
+        if drf_output != fast_output:
+            raise CommandError(f'{label}: fast serializer output differs from the DRF serializer')
+
+        self.stdout.write(
+            f'{label}: {queryset.count()} rows, DRF {drf_time * 1000:.1f} ms, '
+            f'fast {fast_time * 1000:.1f} ms, '
+            + self.style.SUCCESS(f'{drf_time / fast_time:.1f}x faster')
+        )
+
+    def best_of(self, function, repeat):
+        """Return the fastest wall time of several runs and the last output."""
+        best = None
+        output = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
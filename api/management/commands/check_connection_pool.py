@@ -0,0 +1,167 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db.utils import ConnectionHandler
+from api.db.pool import ConnectionPool, PoolTimeout, get_pool_stats
+
+
+def ping(connection):
+    connection.execute('SELECT 1')
+
+
+class Command(BaseCommand):
+    help = (
+        'Exercise the database connection pool against throwaway SQLite files: '
+        'bounded size, checkout timeout, health checks, maximum lifetime and the '
+        'pooled Django backend'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=16,
+            help='Number of threads competing for the pool in the concurrency check'
+        )
+
+    def handle(self, *args, **options):
+        failures = []
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'pool.sqlite3')
+
+            def connect():
+                return sqlite3.connect(path, check_same_thread=False)
+
+            checks = [
+                ('bounded size', lambda: self.check_bounded(connect, options['threads'])),
+                ('checkout timeout', lambda: self.check_timeout(connect)),
+                ('health check', lambda: self.check_health(connect)),
+                ('max lifetime', lambda: self.check_lifetime(connect)),
+                ('django backend', lambda: self.check_backend(path)),
+            ]
+            for label, check in checks:
+                problem = check()
+                status = self.style.ERROR('FAIL') if problem else self.style.SUCCESS('ok')
+                self.stdout.write(f'[{status}] {label}' + (f': {problem}' if problem else ''))
+                if problem:
+                    failures.append(label)
+
+        if failures:
+            raise CommandError(f'{len(failures)} connection pool check(s) failed')
+        self.stdout.write(self.style.SUCCESS('Connection pool behaves as configured'))
+
+    def check_bounded(self, connect, threads):
+        pool = ConnectionPool(connect, ping, max_size=4, timeout=10)
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            for _ in range(5):
+                connection, _ = pool.acquire()
+                with lock:
+                    peak.append(pool.stats()['in_use'])
+                connection.execute('SELECT 1')
+                time.sleep(0.005)
+                pool.release(connection)
+
+        workers = [threading.Thread(target=work) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        stats = pool.stats()
+        self.stdout.write(f'    {stats}')
+        if max(peak) > pool.max_size:
+            return f'{max(peak)} connections in use with max_size {pool.max_size}'
+        if stats['created'] > pool.max_size:
+            return f'{stats["created"]} connections opened for {stats["checkouts"]} checkouts'
+        if stats['in_use'] != 0 or stats['idle'] != stats['created']:
+            return f'{stats["in_use"]} connections leaked'
+        return None
+
+    def check_timeout(self, connect):
+        pool = ConnectionPool(connect, ping, max_size=1, timeout=0.05)
+        connection, _ = pool.acquire()
+        try:
+            pool.acquire()
+        except PoolTimeout:
+            pass
+        else:
+            return 'a checkout beyond max_size did not time out'
+        finally:
+            pool.release(connection)
+
+        _, reused = pool.acquire()
+        if not reused:
+            return 'the released connection was not reused'
+        return None
+
+    def check_health(self, connect):
+        pool = ConnectionPool(connect, ping, max_size=1, check_after=0)
+        connection, _ = pool.acquire()
+        pool.release(connection)
+        # Simulate a connection dropped by the server while idle
+        connection.close()
+
+        replacement, reused = pool.acquire()
+        if reused or replacement is connection:
+            return 'a dead idle connection was handed out'
+        if pool.stats()['unhealthy'] != 1:
+            return 'the dead connection was not counted as unhealthy'
+        replacement.execute('SELECT 1')
+        return None
+
+    def check_lifetime(self, connect):
+        pool = ConnectionPool(connect, ping, max_size=2, max_lifetime=0.05)
+        connection, _ = pool.acquire()
+        pool.release(connection)
+        time.sleep(0.06)
+
+        replacement, reused = pool.acquire()
+        if reused or replacement is connection:
+            return 'a connection past max_lifetime was reused'
+        pool.release(replacement)
+        time.sleep(0.06)
+        pool.acquire()
+        if pool.stats()['expired'] != 2:
+            return 'expired connections were not counted'
+        return None
+
+    def check_backend(self, path):
+        connections = ConnectionHandler({
+            'default': {'ENGINE': 'django.db.backends.dummy'},
+            'pool-check': {
+                'ENGINE': 'api.db.sqlite3',
+                'NAME': path,
+                'POOL': {'MAX_SIZE': 2},
+            }
+        })
+        connection = connections['pool-check']
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        raw = connection.connection
+        connection.close()
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if connection.connection is not raw or not connection.connection_reused:
+            return 'closing the Django connection did not return it to the pool'
+
+        # A connection left with autocommit off is discarded, not pooled
+        connection.set_autocommit(False)
+        connection.close()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if connection.connection is raw:
+            return 'a connection with autocommit off was returned to the pool'
+        connection.close()
+
+        stats = get_pool_stats()['pool-check']
+        self.stdout.write(f'    {stats}')
+        if stats['in_use'] != 0 or stats['discarded'] != 1:
+            return f'unexpected pool state {stats}'
+        return None
@@ -0,0 +1,126 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from api.management.seed import seed_user
+from api.models import Exercise
+from api.views import ExerciseViewSet, TrainingViewSet
+
+
+# Tables small enough that a full scan is expected and harmless
+SCAN_ALLOWED_TABLES = ['muscles']
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway dataset, capture the SQL of the hot read endpoints '
+        'and fail if any query plan falls back to a full scan or a filesort'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--trainings',
+            type=int,
+            default=5000,
+            help='Number of trainings to seed for the probe user'
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=20,
+            help='Number of background users to seed alongside the probe user'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'mysql'):
+            raise CommandError(f'Query plan checks are not supported on {connection.vendor}')
+
+        failures = []
+        with transaction.atomic():
+            user = self.seed(options['trainings'], options['users'])
+            exercise = Exercise.objects.filter(user=user).first()
+
+            probes = [
+                ('history', TrainingViewSet, 'history', {}),
+                ('history period', TrainingViewSet, 'history', {'period': 'last_month'}),
+                ('history exercise', TrainingViewSet, 'history', {'exercise': exercise.id}),
+                ('history muscle', TrainingViewSet, 'history', {'muscle': exercise.muscle_id}),
+                ('history page', TrainingViewSet, 'history', {'page_size': 50}),
+                ('stats', TrainingViewSet, 'stats', {}),
+                ('stats muscle', TrainingViewSet, 'stats', {'muscle': exercise.muscle_id}),
+                ('training list', TrainingViewSet, 'list', {}),
+                ('exercise list', ExerciseViewSet, 'list', {}),
+                ('exercise list muscle', ExerciseViewSet, 'list', {'muscle': exercise.muscle_id}),
+                ('exercise list page', ExerciseViewSet, 'list', {'page_size': 10}),
+            ]
+            for label, viewset, action, params in probes:
+                for sql in self.capture(user, viewset, action, params):
+                    problems = self.check_plan(sql)
+                    status = self.style.ERROR('FAIL') if problems else self.style.SUCCESS('ok')
+                    self.stdout.write(f'[{status}] {label}: {sql[:100]}')
+                    for problem in problems:
+                        self.stdout.write(f'       {problem}')
+                        failures.append(f'{label}: {problem}')
+
+            # Never keep the seeded dataset
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f'{len(failures)} query plan regression(s) found')
+        self.stdout.write(self.style.SUCCESS('All query plans use indexes'))
+
+    def seed(self, training_count, user_count):
+        """Seed a probe user plus background users so index selectivity is realistic."""
+        probe = seed_user('query-plan-probe', training_count)
+        for index in range(user_count):
+            seed_user(f'query-plan-background-{index}', training_count // 10)
+
+        # Refresh SQLite's planner statistics for the seeded rows. MySQL's
+        # ANALYZE TABLE commits the open transaction implicitly, which would
+        # keep the dataset; InnoDB estimates ranges by index dives on the
+        # transaction's own rows instead
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        return probe
+
+    def capture(self, user, viewset, action, params):
+        """Run a viewset action and return the SELECT statements it executed."""
+        request = APIRequestFactory().get('/', params)
+        force_authenticate(request, user=user)
+        view = viewset.as_view({'get': action})
+
+        with CaptureQueriesContext(connection) as context:
+            response = view(request)
+            response.render()
+
+        if response.status_code != 200:
+            raise CommandError(f'{viewset.__name__}.{action} returned {response.status_code}')
+        return [query['sql'] for query in context.captured_queries if query['sql'].startswith('SELECT')]
+
+    def check_plan(self, sql):
+        """Return a list of plan problems (full scans, filesorts) for a query."""
+        problems = []
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                for row in cursor.fetchall():
+                    detail = row[-1]
+                    words = detail.split()
+                    if words[:1] == ['SCAN'] and 'INDEX' not in words:
+                        table = words[1].strip('"')
+                        if table not in SCAN_ALLOWED_TABLES:
+                            problems.append(f'full scan: {detail}')
+                    if 'TEMP B-TREE' in detail:
+                        problems.append(f'filesort: {detail}')
+            else:
+                cursor.execute(f'EXPLAIN {sql}')
+                columns = [column[0] for column in cursor.description]
+                for values in cursor.fetchall():
+                    row = dict(zip(columns, values))
+                    extra = row.get('Extra') or ''
+                    if row.get('type') == 'ALL' and row.get('table') not in SCAN_ALLOWED_TABLES:
+                        problems.append(f"full scan: {row.get('table')}")
+                    if 'Using filesort' in extra:
+                        problems.append(f"filesort: {row.get('table')} ({extra})")
+        return problems
@@ -0,0 +1,112 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.test import override_settings
+from api.db import routers
+from api.models import IdempotencyKey, RevokedToken, Training
+
+
+REPLICAS = ['replica-a', 'replica-b']
+
+
+class Command(BaseCommand):
+    help = (
+        'Check the read-replica routing decisions against stand-in replica aliases: '
+        'safe requests read from a replica, writes and unsafe requests use the '
+        'primary, and users are pinned to the primary after a write'
+    )
+
+    def handle(self, *args, **options):
+        router = routers.ReplicaRouter()
+        failures = []
+
+        with override_settings(DATABASE_REPLICAS=REPLICAS, REPLICA_PIN_SECONDS=0.2, REPLICA_PIN_CACHE_ALIAS=None):
+            checks = [
+                ('safe request reads from a replica', lambda: self.check_safe(router)),
+                ('unsafe request stays on the primary', lambda: self.check_unsafe(router)),
+                ('primary-only models', lambda: self.check_primary_only(router)),
+                ('reads inside a transaction', lambda: self.check_atomic(router)),
+                ('read-your-writes pin', lambda: self.check_pin(router)),
+            ]
+            for label, check in checks:
+                problem = check()
+                status = self.style.ERROR('FAIL') if problem else self.style.SUCCESS('ok')
+                self.stdout.write(f'[{status}] {label}' + (f': {problem}' if problem else ''))
+                if problem:
+                    failures.append(label)
+
+        with override_settings(DATABASE_REPLICAS=[]):
+            token = routers.start_request(safe=True)
+            try:
+                alias = router.db_for_read(Training)
+            finally:
+                routers.end_request(token)
+        if alias != DEFAULT_DB_ALIAS:
+            failures.append('no replicas')
+            self.stdout.write(f'[{self.style.ERROR("FAIL")}] no replicas configured: read from {alias}')
+
+        if failures:
+            raise CommandError(f'{len(failures)} routing check(s) failed')
+        self.stdout.write(self.style.SUCCESS('Replica routing behaves as configured'))
+
+    def route(self, router, safe, model=Training, user_id=None):
+        token = routers.start_request(safe)
+        try:
+            if user_id is not None:
+                routers.use_primary_if_pinned(user_id)
+            return router.db_for_read(model), router.db_for_write(model)
+        finally:
+            routers.end_request(token)
+
+    def check_safe(self, router):
+        seen = set()
+        for _ in range(50):
+            read, write = self.route(router, safe=True)
+            if write != DEFAULT_DB_ALIAS:
+                return f'write routed to {write}'
+            seen.add(read)
+        if not seen <= set(REPLICAS):
+            return f'reads routed to {sorted(seen)}'
+        if routers.get_read_alias() is not None:
+            return 'replica choice leaked out of the request'
+        return None
+
+    def check_unsafe(self, router):
+        read, _ = self.route(router, safe=False)
+        if read != DEFAULT_DB_ALIAS:
+            return f'read routed to {read}'
+        return None
+
+    def check_primary_only(self, router):
+        for model in (RevokedToken, IdempotencyKey):
+            read, _ = self.route(router, safe=True, model=model)
+            if read != DEFAULT_DB_ALIAS:
+                return f'{model.__name__} read from {read}'
+        return None
+
+    def check_atomic(self, router):
+        token = routers.start_request(safe=True)
+        try:
+            with transaction.atomic():
+                read = router.db_for_read(Training)
+        finally:
+            routers.end_request(token)
+        if read != DEFAULT_DB_ALIAS:
+            return f'read inside a transaction routed to {read}'
+        return None
+
+    def check_pin(self, router):
+        writer, other = -1, -2
+        routers.pin_user(writer)
+        read, _ = self.route(router, safe=True, user_id=writer)
+        if read != DEFAULT_DB_ALIAS:
+            return f'user read from {read} right after a write'
+        read, _ = self.route(router, safe=True, user_id=other)
+        if read not in REPLICAS:
+            return f'another user was pinned too ({read})'
+
+        time.sleep(0.25)
+        read, _ = self.route(router, safe=True, user_id=writer)
+        if read not in REPLICAS:
+            return f'user still read from {read} after the pin expired'
+        return None
@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from api.conditional import bump_data_versions
+from api.models import User, ArchivedTraining, ExerciseStats, Training, TrainingRollup
+from api.rollups import GRANULARITIES, compute_rollups, merge_rollups
+from api.stats import STATS_FIELDS, compute_exercise_stats, merge_exercise_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the exercise statistics and volume rollup tables from the training log, including archived trainings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of users to recompute per transaction'
+        )
+        parser.add_argument(
+            '--user',
+            type=int,
+            help='Only rebuild statistics for this user ID'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+
+        user_ids = User.objects.order_by('id').values_list('id', flat=True)
+        if options['user']:
+            user_ids = user_ids.filter(id=options['user'])
+
+        rebuilt_count = 0
+        last_id = 0
+        while True:
+            chunk = list(user_ids.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            last_id = chunk[-1]
+
+            trainings = Training.objects.filter(user_id__in=chunk)
+            archived = ArchivedTraining.objects.filter(user_id__in=chunk)
+            rows = merge_exercise_stats(compute_exercise_stats(trainings), compute_exercise_stats(archived))
+            with transaction.atomic():
+                ExerciseStats.objects.filter(user_id__in=chunk).delete()
+                created = ExerciseStats.objects.bulk_create(
+                    [
+                        ExerciseStats(
+                            user_id=row['user_id'],
+                            exercise_id=row['exercise_id'],
+                            **{field: row[field] for field in STATS_FIELDS}
+                        )
+                        for row in rows
+                    ],
+                    batch_size=chunk_size
+                )
+                TrainingRollup.objects.filter(user_id__in=chunk).delete()
+                for granularity in GRANULARITIES:
+                    TrainingRollup.objects.bulk_create(
+                        [
+                            TrainingRollup(granularity=granularity, **rollup)
+                            for rollup in merge_rollups(
+                                compute_rollups(trainings, granularity),
+                                compute_rollups(archived, granularity)
+                            )
+                        ],
+                        batch_size=chunk_size
+                    )
+                # Drop the ETags and cached responses built from the old rows
+                bump_data_versions(chunk)
+            rebuilt_count += len(created)
+            self.stdout.write(f'Rebuilt statistics for users up to ID {last_id}')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt {rebuilt_count} exercise statistics rows')
+        )
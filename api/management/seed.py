@@ -0,0 +1,55 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+from api.models import User, Muscle, Exercise, Training
+from api.stats import refresh_exercise_stats
+
+
+def seed_user(name, training_count, exercises_per_muscle=5):
+    """
+    Create a throwaway user with exercises on every muscle and a spread of
+    trainings, for the query plan and benchmark commands.
+    """
+    muscles = [Muscle.objects.get_or_create(name=muscle)[0] for muscle, _ in Muscle.MUSCLE_CHOICES]
+
+    user = User.objects.create_user(
+        email=f'{name}@example.com',
+        password=None,
+        username=name,
+        first_name='Seed',
+        last_name='User'
+    )
+    Exercise.objects.bulk_create([
+        Exercise(user=user, muscle=muscle, name=f'Exercise {index}')
+        for muscle in muscles
+        for index in range(exercises_per_muscle)
+    ])
+    # MySQL does not return the IDs of bulk-inserted rows; read them back
+    exercises = list(Exercise.objects.filter(user=user).order_by('id'))
+
+    now = timezone.now()
+    Training.objects.bulk_create([
+        Training(
+            user=user,
+            exercise=random.choice(exercises),
+            weight=Decimal(random.randint(1000, 15000)) / 100,
+            sets=random.randint(1, 5),
+            repetitions=random.randint(1, 15)
+        )
+        for _ in range(training_count)
+    ], batch_size=1000)
+    # auto_now_add ignores explicit values, so spread the history afterwards
+    training_ids = Training.objects.filter(user=user).order_by('id').values_list('id', flat=True)
+    Training.objects.bulk_update(
+        [
+            Training(id=training_id, datetime=now - timedelta(hours=index * 3))
+            for index, training_id in enumerate(training_ids)
+        ],
+        ['datetime'],
+        batch_size=1000
+    )
+
+    for exercise in exercises:
+        refresh_exercise_stats(user.id, exercise.id)
+    return user
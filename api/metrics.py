@@ -0,0 +1,26 @@
+import threading
+from copy import deepcopy
+
+
+_lock = threading.Lock()
+_metrics = {}
+
+
+def increment(namespace, key, **values):
+    """Add ``values`` to the counters of ``key`` within ``namespace``."""
+    with _lock:
+        counters = _metrics.setdefault(namespace, {}).setdefault(key, {})
+        for name, value in values.items():
+            counters[name] = counters.get(name, 0) + value
+
+
+def snapshot():
+    """Return a copy of every counter recorded by this process."""
+    with _lock:
+        return deepcopy(_metrics)
+
+
+def reset():
+    """Clear every counter recorded by this process."""
+    with _lock:
+        _metrics.clear()
@@ -0,0 +1,239 @@
+import re
+import time
+import zlib
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from . import metrics
+from .db import routers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+DEFAULT_MIN_SIZE = 1024
+
+DEFAULT_EXCLUDED_CONTENT_TYPES = [
+    'image/',
+    'video/',
+    'audio/',
+    'font/woff',
+    'application/zip',
+    'application/gzip',
+    'application/x-gzip',
+    'application/zstd',
+    'application/x-bzip2',
+    'application/x-7z-compressed',
+    'application/octet-stream',
+]
+
+re_accept_encoding = re.compile(r'\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+class BrotliCompressor:
+    """Adapter giving brotli.Compressor the compress/flush interface of zlib."""
+
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=5)
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def flush(self):
+        return self.compressor.finish()
+
+
+def get_compressors():
+    """Return the available encodings mapped to compressor factories, best first."""
+    compressors = {}
+    if zstandard is not None:
+        compressors['zstd'] = lambda: zstandard.ZstdCompressor(level=3).compressobj()
+    if brotli is not None:
+        compressors['br'] = BrotliCompressor
+    compressors['gzip'] = lambda: zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    compressors['deflate'] = lambda: zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS)
+    return compressors
+
+
+COMPRESSORS = get_compressors()
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick the best supported encoding from an Accept-Encoding header, or None."""
+    qualities = {}
+    for match in re_accept_encoding.finditer(accept_encoding):
+        coding = match.group(1).lower()
+        try:
+            qualities[coding] = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            continue
+
+    best, best_quality = None, 0
+    # COMPRESSORS is in server preference order, which breaks quality ties
+    for coding in COMPRESSORS:
+        quality = qualities.get(coding, qualities.get('*', 0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best encoding the client accepts.
+
+    Negotiates zstd and br (when the optional zstandard/brotli packages are
+    installed), gzip and deflate. Bodies smaller than COMPRESSION_MIN_SIZE and
+    already-compressed content types are sent as-is; streaming responses are
+    compressed chunk by chunk. Per-endpoint byte counts and compression time
+    are recorded in the ``compression`` metrics namespace.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE)
+        self.excluded_content_types = tuple(
+            getattr(settings, 'COMPRESSION_EXCLUDED_CONTENT_TYPES', DEFAULT_EXCLUDED_CONTENT_TYPES)
+        )
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.has_header('Content-Encoding'):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+        content_type = response.get('Content-Type', '').lower()
+        if content_type.startswith(self.excluded_content_types):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        endpoint = self.get_endpoint(request)
+        compressor = COMPRESSORS[encoding]()
+
+        if response.streaming:
+            if response.is_async:
+                return response
+            response.streaming_content = self.compress_stream(
+                response.streaming_content, compressor, endpoint, encoding
+            )
+            del response.headers['Content-Length']
+        else:
+            start = time.perf_counter()
+            compressed = compressor.compress(response.content) + compressor.flush()
+            elapsed = time.perf_counter() - start
+            if len(compressed) >= len(response.content):
+                return response
+            self.record(endpoint, encoding, len(response.content), len(compressed), elapsed)
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # A compressed representation is no longer byte-identical
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def compress_stream(self, chunks, compressor, endpoint, encoding):
+        """Compress a streaming body chunk by chunk, recording totals at the end."""
+        size_in = size_out = 0
+        elapsed = 0.0
+        for chunk in chunks:
+            start = time.perf_counter()
+            data = compressor.compress(chunk)
+            elapsed += time.perf_counter() - start
+            size_in += len(chunk)
+            if data:
+                size_out += len(data)
+                yield data
+
+        start = time.perf_counter()
+        data = compressor.flush()
+        elapsed += time.perf_counter() - start
+        size_out += len(data)
+        self.record(endpoint, encoding, size_in, size_out, elapsed)
+        yield data
+
+    def get_endpoint(self, request):
+        match = getattr(request, 'resolver_match', None)
+        return match.view_name if match else request.path
+
+    def record(self, endpoint, encoding, size_in, size_out, elapsed):
+        metrics.increment(
+            'compression',
+            endpoint,
+            responses=1,
+            bytes_in=size_in,
+            bytes_out=size_out,
+            seconds=elapsed,
+            **{f'responses_{encoding}': 1}
+        )
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route the reads of GET, HEAD and OPTIONS requests to a read replica
+    (api.db.routers.ReplicaRouter) and pin users to the primary after a write.
+    """
+
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        safe = request.method in self.safe_methods
+        token = routers.start_request(safe)
+        try:
+            response = self.get_response(request)
+            if safe and routers.get_replicas():
+                if routers.get_read_alias() is None:
+                    metrics.increment('db_router', 'requests', primary=1)
+                else:
+                    metrics.increment('db_router', 'requests', replica=1)
+            # Streamed bodies (the training export) run their queries after
+            # this returns; keep them on the database the request used
+            if response.streaming and not response.is_async:
+                response.streaming_content = routers.iterate_with_read_alias(
+                    response.streaming_content, routers.get_read_alias()
+                )
+        finally:
+            routers.end_request(token)
+
+        # DRF stores the authenticated user on the underlying request
+        user = getattr(request, 'user', None)
+        if not safe and routers.get_replicas() and user is not None and user.is_authenticated:
+            routers.pin_user(user.id)
+        return response
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Add RateLimit-Policy, RateLimit-Limit, RateLimit-Remaining and
+    RateLimit-Reset headers from the state recorded by SlidingWindowThrottle.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        state = getattr(request, 'rate_limit', None)
+        if state is not None:
+            response['RateLimit-Policy'] = state['policy']
+            response['RateLimit-Limit'] = str(state['limit'])
+            response['RateLimit-Remaining'] = str(state['remaining'])
+            response['RateLimit-Reset'] = str(state['reset'])
+        return response
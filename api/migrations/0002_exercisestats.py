@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:44
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExerciseStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('low_weight', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('high_weight', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('last_weight', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('last_datetime', models.DateTimeField()),
+                ('total_sessions', models.PositiveIntegerField(default=0)),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='api.exercise')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exercise_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'exercise_stats',
+                'unique_together': {('user', 'exercise')},
+            },
+        ),
+    ]
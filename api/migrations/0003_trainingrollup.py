@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_exercisestats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=10)),
+                ('bucket_start', models.DateField()),
+                ('volume', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='api.exercise')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='training_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'training_rollups',
+                'unique_together': {('user', 'exercise', 'granularity', 'bucket_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_trainingrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='training',
+            index=models.Index(fields=['user', '-datetime', '-id'], name='training_user_dt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='training',
+            index=models.Index(fields=['user', 'exercise', '-datetime', '-id'], name='training_user_ex_dt_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:04
+
+from django.db import migrations
+
+
+BATCH_SIZE = 5000
+
+
+def backfill_change_log(apps, schema_editor):
+    """Log every existing exercise, then every training, as an upsert."""
+    ChangeLog = apps.get_model('api', 'ChangeLog')
+
+    for model_name, model in [('exercise', apps.get_model('api', 'Exercise')), ('training', apps.get_model('api', 'Training'))]:
+        last_id = 0
+        while True:
+            rows = list(
+                model.objects
+                .filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'user_id')[:BATCH_SIZE]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            ChangeLog.objects.bulk_create([
+                ChangeLog(user_id=user_id, model=model_name, object_id=object_id, action='upsert')
+                for object_id, user_id in rows
+            ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_change_log'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_change_log, migrations.RunPython.noop),
+    ]
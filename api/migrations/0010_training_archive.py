@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTraining',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('weight', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('sets', models.PositiveIntegerField()),
+                ('repetitions', models.PositiveIntegerField()),
+                ('datetime', models.DateTimeField()),
+                ('client_id', models.UUIDField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_trainings', to='api.exercise')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_trainings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'training_archive',
+                'ordering': ['-datetime'],
+                'indexes': [models.Index(fields=['user', '-datetime', '-id'], name='training_arch_user_dt_idx'), models.Index(fields=['user', 'exercise', '-datetime', '-id'], name='training_arch_user_ex_dt_idx')],
+            },
+        ),
+    ]
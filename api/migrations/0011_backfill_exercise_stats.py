@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:02
+
+from django.db import migrations
+from django.db.models import Count, Max, Min, OuterRef, Subquery
+
+
+USER_BATCH_SIZE = 500
+
+
+def compute_stats(model, user_ids):
+    """Group the trainings of some users per exercise, like api.stats.compute_exercise_stats."""
+    last_weight = model.objects.filter(
+        user_id=OuterRef('user_id'),
+        exercise_id=OuterRef('exercise_id')
+    ).order_by('-datetime', '-id').values('weight')[:1]
+
+    return (
+        model.objects
+        .filter(user_id__in=user_ids)
+        .order_by()
+        .values('user_id', 'exercise_id')
+        .annotate(
+            low_weight=Min('weight'),
+            high_weight=Max('weight'),
+            last_weight=Subquery(last_weight),
+            last_datetime=Max('datetime'),
+            total_sessions=Count('id')
+        )
+    )
+
+
+def backfill_exercise_stats(apps, schema_editor):
+    """Compute the statistics table from the hot and archived trainings of every user."""
+    User = apps.get_model('api', 'User')
+    ExerciseStats = apps.get_model('api', 'ExerciseStats')
+    models = [apps.get_model('api', 'Training'), apps.get_model('api', 'ArchivedTraining')]
+
+    last_id = 0
+    while True:
+        user_ids = list(User.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:USER_BATCH_SIZE])
+        if not user_ids:
+            break
+        last_id = user_ids[-1]
+
+        stats = {}
+        for model in models:
+            for row in compute_stats(model, user_ids):
+                key = (row['user_id'], row['exercise_id'])
+                current = stats.get(key)
+                if current is None:
+                    stats[key] = row
+                    continue
+                current['low_weight'] = min(current['low_weight'], row['low_weight'])
+                current['high_weight'] = max(current['high_weight'], row['high_weight'])
+                current['total_sessions'] += row['total_sessions']
+                if row['last_datetime'] > current['last_datetime']:
+                    current['last_weight'] = row['last_weight']
+                    current['last_datetime'] = row['last_datetime']
+
+        # Replace rows written by rebuild_stats or live writes since 0002
+        ExerciseStats.objects.filter(user_id__in=user_ids).delete()
+        ExerciseStats.objects.bulk_create([ExerciseStats(**row) for row in stats.values()])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_training_archive'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_exercise_stats, migrations.RunPython.noop),
+    ]
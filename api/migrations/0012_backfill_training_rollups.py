@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:08
+
+from django.db import migrations
+from django.db.models import Count, DateField, DecimalField, F, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+
+
+USER_BATCH_SIZE = 500
+
+TRUNC_FUNCTIONS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+def compute_rollups(model, user_ids, granularity):
+    """Sum the trainings of some users per exercise and bucket, like api.rollups.compute_rollups."""
+    return (
+        model.objects
+        .filter(user_id__in=user_ids)
+        .order_by()
+        .annotate(bucket_start=TRUNC_FUNCTIONS[granularity]('datetime', output_field=DateField()))
+        .values('user_id', 'exercise_id', 'bucket_start')
+        .annotate(
+            volume=Sum(
+                F('weight') * F('sets') * F('repetitions'),
+                output_field=DecimalField(max_digits=14, decimal_places=2)
+            ),
+            sessions=Count('id')
+        )
+    )
+
+
+def backfill_training_rollups(apps, schema_editor):
+    """Compute the day, week and month rollups from the hot and archived trainings of every user."""
+    User = apps.get_model('api', 'User')
+    TrainingRollup = apps.get_model('api', 'TrainingRollup')
+    models = [apps.get_model('api', 'Training'), apps.get_model('api', 'ArchivedTraining')]
+
+    last_id = 0
+    while True:
+        user_ids = list(User.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:USER_BATCH_SIZE])
+        if not user_ids:
+            break
+        last_id = user_ids[-1]
+
+        rollups = {}
+        for granularity in TRUNC_FUNCTIONS:
+            for model in models:
+                for row in compute_rollups(model, user_ids, granularity):
+                    key = (row['user_id'], row['exercise_id'], granularity, row['bucket_start'])
+                    current = rollups.get(key)
+                    if current is None:
+                        rollups[key] = TrainingRollup(granularity=granularity, **row)
+                    else:
+                        current.volume += row['volume']
+                        current.sessions += row['sessions']
+
+        # Replace rows written by rebuild_stats or live writes since 0003
+        TrainingRollup.objects.filter(user_id__in=user_ids).delete()
+        TrainingRollup.objects.bulk_create(rollups.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_backfill_exercise_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_training_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,138 @@
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .pagination import merge_ordered
+
+
+class SparseFieldsMixin:
+    """
+    Support ``?fields=a,b`` on read requests.
+
+    The serializer output is trimmed to the requested fields and the queryset
+    is narrowed with ``only()``, keeping just the ``select_related`` joins that
+    the requested fields traverse.
+    """
+
+    fields_query_param = 'fields'
+
+    def get_requested_fields(self):
+        """Return the requested field names, or None when all fields are wanted."""
+        if not hasattr(self, '_requested_fields'):
+            self._requested_fields = self.parse_requested_fields()
+        return self._requested_fields
+
+    def parse_requested_fields(self):
+        """Parse and validate the fields query parameter of a read request."""
+        if self.request is None or self.request.method not in ('GET', 'HEAD'):
+            return None
+
+        raw = self.request.query_params.get(self.fields_query_param)
+        if not raw:
+            return None
+
+        requested = [name.strip() for name in raw.split(',') if name.strip()]
+        readable = self.get_readable_fields()
+        unknown = [name for name in requested if name not in readable]
+        if unknown:
+            raise serializers.ValidationError({
+                self.fields_query_param: f'Unknown field(s): {", ".join(unknown)}.'
+            })
+        return requested
+
+    def get_readable_fields(self):
+        """Map every readable serializer field name to its ORM lookup path."""
+        serializer = self.get_serializer_class()()
+        return {
+            name: field.source.replace('.', '__')
+            for name, field in serializer.fields.items()
+            if not field.write_only
+        }
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset
+
+        readable = self.get_readable_fields()
+        lookups = {readable[name] for name in fields}
+        # Keep the pagination ordering columns loaded as well
+        lookups.update(field.lstrip('-') for field in getattr(self.paginator, 'ordering', ()))
+
+        relations = set()
+        for lookup in lookups:
+            parts = lookup.split('__')
+            relations.update('__'.join(parts[:index]) for index in range(1, len(parts)))
+
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*lookups, *relations)
+
+
+class FastListMixin:
+    """
+    Serve list-style responses through a FastReadSerializer when enabled.
+
+    Set ``fast_serializer_class`` on the view and ``FAST_READ_SERIALIZERS = True``
+    in settings to opt in; otherwise the regular DRF serializer is used.
+    """
+
+    fast_serializer_class = None
+
+    def use_fast_serializer(self):
+        return self.fast_serializer_class is not None and getattr(settings, 'FAST_READ_SERIALIZERS', False)
+
+    def get_requested_fields(self):
+        return None
+
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+
+    def list_response(self, queryset, extra_querysets=()):
+        """
+        Paginate (if requested) and serialize a queryset into a list response.
+
+        Rows of ``extra_querysets`` (querysets of models with the same fields,
+        e.g. archived trainings) are merged in in pagination order.
+        """
+        querysets = [queryset, *extra_querysets]
+        if self.use_fast_serializer():
+            serializer = self.fast_serializer_class
+            fields = self.get_requested_fields()
+            ordering = [field.lstrip('-') for field in getattr(self.paginator, 'ordering', ())]
+            querysets = [serializer.get_queryset(queryset, fields, extra_lookups=ordering) for queryset in querysets]
+            page = self.paginate_querysets(querysets)
+            if page is not None:
+                return self.get_paginated_response(serializer.serialize(page, fields))
+            return Response(serializer.serialize(self.merge_querysets(querysets), fields))
+
+        page = self.paginate_querysets(querysets)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(self.merge_querysets(querysets), many=True)
+        return Response(serializer.data)
+
+    def paginate_querysets(self, querysets):
+        if len(querysets) == 1:
+            return self.paginate_queryset(querysets[0])
+        if self.paginator is None:
+            return None
+        return self.paginator.paginate_querysets(querysets, self.request, view=self)
+
+    def merge_querysets(self, querysets):
+        """Return the rows of several querysets as one list in pagination order."""
+        if len(querysets) == 1:
+            return querysets[0]
+        ordering = self.paginator.ordering
+        return list(merge_ordered([queryset.order_by(*ordering) for queryset in querysets], ordering))
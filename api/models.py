@@ -1,3 +1,4 @@
+import unicodedata
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.core.validators import MinLengthValidator
@@ -83,15 +84,30 @@ class Exercise(models.Model):
     muscle = models.ForeignKey(Muscle, on_delete=models.CASCADE, related_name='exercises')
     name = models.CharField(max_length=255)
     note = models.TextField(blank=True, null=True)
+    client_id = models.UUIDField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'exercises'
         unique_together = ['user', 'muscle', 'name']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], name='exercise_user_client_id_uniq'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.muscle.name}) - {self.user.username}"
+    
+    @staticmethod
+    def get_name_key(name):
+        """
+        Return an exercise name in the form the unique constraint compares it.
+        
+        Follows utf8mb4_unicode_ci, the collation of the MySQL database, which
+        ignores case, accents and trailing spaces.
+        """
+        decomposed = unicodedata.normalize('NFKD', name)
+        return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold().rstrip(' ')
 
 
 class Training(models.Model):
@@ -103,10 +119,172 @@ class Training(models.Model):
     sets = models.PositiveIntegerField()
     repetitions = models.PositiveIntegerField()
     datetime = models.DateTimeField(auto_now_add=True)
+    client_id = models.UUIDField(blank=True, null=True)
     
     class Meta:
         db_table = 'training'
         ordering = ['-datetime']
+        indexes = [
+            models.Index(fields=['user', '-datetime', '-id'], name='training_user_dt_idx'),
+            models.Index(fields=['user', 'exercise', '-datetime', '-id'], name='training_user_ex_dt_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], name='training_user_client_id_uniq'),
+        ]
     
     def __str__(self):
         return f"{self.exercise.name} - {self.weight}kg x {self.sets}x{self.repetitions} ({self.datetime})"
+
+
+class ArchivedTraining(models.Model):
+    """Training moved out of the hot training table by the archive_trainings command."""
+    
+    # Keeps the ID the training had in the hot table
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_trainings')
+    exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name='archived_trainings')
+    weight = models.DecimalField(max_digits=6, decimal_places=2)
+    sets = models.PositiveIntegerField()
+    repetitions = models.PositiveIntegerField()
+    datetime = models.DateTimeField()
+    client_id = models.UUIDField(blank=True, null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'training_archive'
+        ordering = ['-datetime']
+        indexes = [
+            models.Index(fields=['user', '-datetime', '-id'], name='training_arch_user_dt_idx'),
+            models.Index(fields=['user', 'exercise', '-datetime', '-id'], name='training_arch_user_ex_dt_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.exercise.name} - {self.weight}kg x {self.sets}x{self.repetitions} ({self.datetime}, archived)"
+
+
+class ExerciseStats(models.Model):
+    """Materialized per-exercise training statistics, kept in sync with Training writes."""
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='exercise_stats')
+    exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name='stats')
+    low_weight = models.DecimalField(max_digits=6, decimal_places=2)
+    high_weight = models.DecimalField(max_digits=6, decimal_places=2)
+    last_weight = models.DecimalField(max_digits=6, decimal_places=2)
+    last_datetime = models.DateTimeField()
+    total_sessions = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'exercise_stats'
+        unique_together = ['user', 'exercise']
+    
+    def __str__(self):
+        return f"{self.exercise.name} stats - {self.user.username}"
+
+
+class TrainingRollup(models.Model):
+    """Pre-aggregated training volume per exercise and time bucket."""
+    
+    GRANULARITY_CHOICES = [
+        ('day', 'Day'),
+        ('week', 'Week'),
+        ('month', 'Month'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='training_rollups')
+    exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name='rollups')
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateField()
+    volume = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    sessions = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'training_rollups'
+        unique_together = ['user', 'exercise', 'granularity', 'bucket_start']
+    
+    def __str__(self):
+        return f"{self.exercise.name} {self.granularity} {self.bucket_start} - {self.user.username}"
+
+
+class UserDataVersion(models.Model):
+    """Per-user counter bumped on every Exercise or Training write, used for conditional GETs."""
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='data_version')
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'user_data_versions'
+    
+    def __str__(self):
+        return f"{self.user.username} v{self.version}"
+
+
+class RevokedToken(models.Model):
+    """Revoked JWT (logged out or rotated refresh token), kept until the token expires."""
+    
+    jti = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='revoked_tokens')
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        db_table = 'revoked_tokens'
+    
+    def __str__(self):
+        return f"{self.jti} ({self.user.username})"
+
+
+class ChangeLog(models.Model):
+    """
+    Latest change of every exercise and training, used as the delta-sync feed.
+    
+    Each write replaces the object's previous entry, so the auto-increment ID is
+    a per-user sync cursor and the table holds one row per live object plus
+    one tombstone per deleted object.
+    """
+    
+    ACTION_CHOICES = [
+        ('upsert', 'Created or updated'),
+        ('delete', 'Deleted'),
+    ]
+    
+    MODEL_CHOICES = [
+        ('exercise', 'Exercise'),
+        ('training', 'Training'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='changes')
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changed_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'change_log'
+        indexes = [
+            models.Index(fields=['user', 'id'], name='change_log_user_id_idx'),
+            models.Index(fields=['model', 'object_id'], name='change_log_object_idx'),
+        ]
+    
+    def __str__(self):
+        return f"#{self.id} {self.action} {self.model} {self.object_id}"
+
+
+class IdempotencyKey(models.Model):
+    """Stored outcome of a POST sent with an Idempotency-Key header, replayed on retries."""
+    
+    owner = models.CharField(max_length=64)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    content_type = models.CharField(max_length=255, blank=True)
+    body = models.BinaryField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        db_table = 'idempotency_keys'
+        unique_together = ['owner', 'key']
+    
+    def __str__(self):
+        return f"{self.owner} {self.key} ({self.status_code or 'in progress'})"
@@ -0,0 +1,69 @@
+import hashlib
+import threading
+import time
+from django.conf import settings
+
+from .models import Muscle
+
+
+class MuscleCatalog:
+    """Immutable snapshot of the muscle table with its pre-encoded JSON responses."""
+
+    def __init__(self, muscles):
+        from .renderers import FastJSONRenderer
+        from .serializers import MuscleSerializer
+
+        renderer = FastJSONRenderer()
+        self.data = MuscleSerializer(muscles, many=True).data
+        self.items = {item['id']: item for item in self.data}
+        self.names = {item['id']: item['name'] for item in self.data}
+        self.list_body = renderer.render(self.data)
+        self.detail_bodies = {item['id']: renderer.render(item) for item in self.data}
+        # Changes whenever a muscle is added, renamed or removed
+        self.version = hashlib.sha256(self.list_body).hexdigest()[:16]
+        self.loaded_at = time.monotonic()
+
+    @staticmethod
+    def get_etag(body):
+        """Strong ETag of an encoded response body."""
+        return '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+class MuscleRegistry:
+    """
+    Process-wide cache of the fixed muscle catalog.
+
+    The catalog is loaded with one query on first use and kept until a Muscle
+    save or delete signal invalidates it. MUSCLE_REGISTRY_TTL bounds how long
+    other worker processes may serve a catalog edited through another one.
+    """
+
+    def __init__(self):
+        self._catalog = None
+        self._lock = threading.Lock()
+
+    def get_catalog(self):
+        catalog = self._catalog
+        ttl = getattr(settings, 'MUSCLE_REGISTRY_TTL', 3600)
+        if catalog is None or (ttl and time.monotonic() - catalog.loaded_at > ttl):
+            with self._lock:
+                if self._catalog is catalog:
+                    self._catalog = MuscleCatalog(Muscle.objects.order_by('id'))
+                catalog = self._catalog
+        return catalog
+
+    def get_name(self, muscle_id):
+        """Return the name of a muscle, reloading once for IDs added since the last load."""
+        if muscle_id is None:
+            return None
+        name = self.get_catalog().names.get(muscle_id)
+        if name is None:
+            self.invalidate()
+            name = self.get_catalog().names.get(muscle_id)
+        return name
+
+    def invalidate(self):
+        self._catalog = None
+
+
+muscle_registry = MuscleRegistry()
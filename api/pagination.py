@@ -0,0 +1,226 @@
+import base64
+import binascii
+import heapq
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def keyset_filter(ordering, position):
+    """Build the lexicographic "after this position" condition for an ordering."""
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def get_position(ordering, item):
+    """Return the ordering values of a model instance or values() dict."""
+    return [
+        item[field.lstrip('-')] if isinstance(item, dict) else getattr(item, field.lstrip('-'))
+        for field in ordering
+    ]
+
+
+def merge_ordered(iterables, ordering):
+    """
+    Lazily merge iterables of rows that are each sorted by ``ordering``.
+
+    Used to read hot and archived trainings as one ordered sequence. All
+    ordering fields must sort in the same direction.
+    """
+    directions = {field.startswith('-') for field in ordering}
+    if len(directions) != 1:
+        raise ValueError('Only orderings with a single direction can be merged')
+    return heapq.merge(
+        *iterables,
+        key=lambda item: get_position(ordering, item),
+        reverse=directions.pop()
+    )
+
+
+def iterate_keyset(queryset, ordering, batch_size=2000):
+    """
+    Yield every row of a queryset in keyset-ordered batches.
+
+    Each batch is a separate LIMIT query that resumes after the last row of
+    the previous one, so memory stays bounded even on drivers that buffer
+    whole result sets client side.
+    """
+    queryset = queryset.order_by(*ordering)
+    position = None
+    while True:
+        batch = queryset
+        if position is not None:
+            batch = batch.filter(keyset_filter(ordering, position))
+        rows = list(batch[:batch_size])
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        position = get_position(ordering, rows[-1])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor keyset pagination.
+
+    Pages are selected with a WHERE clause on the ordering columns of the last
+    row served, never with OFFSET, so every page costs the same. Pagination is
+    opt-in: requests without ``cursor`` or ``page_size`` get the full list.
+    """
+
+    ordering = ('-id',)
+    page_size = 100
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return one page of the queryset, or None when pagination was not requested."""
+        return self.paginate_querysets([queryset], request, view)
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        Return one page of the rows of several querysets merged in ordering
+        order, or None when pagination was not requested.
+
+        Every queryset contributes at most one page worth of rows after the
+        cursor, so the cost per page stays constant.
+        """
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = querysets[0].model
+
+        cursor = self.decode_cursor(request)
+        pages = []
+        for queryset in querysets:
+            queryset = queryset.order_by(*self.ordering)
+            if cursor is not None:
+                queryset = queryset.filter(self.get_keyset_filter(cursor))
+            # Fetch one extra row to learn whether there is a next page
+            pages.append(list(queryset[:self.page_size + 1]))
+
+        if len(pages) == 1:
+            results = pages[0]
+        else:
+            results = list(merge_ordered(pages, self.ordering))[:self.page_size + 1]
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        """Return the requested page size, clamped to max_page_size."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_keyset_filter(self, cursor):
+        """Build the "after this position" condition for the ordering."""
+        return keyset_filter(self.ordering, cursor)
+
+    def get_position(self, item):
+        """Return the ordering values of a row as JSON-compatible values."""
+        return [
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in get_position(self.ordering, item)
+        ]
+
+    def encode_cursor(self, position):
+        """Encode a position into an opaque cursor string."""
+        data = json.dumps(position, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        """Decode the cursor of a request into typed ordering values."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError
+            return [
+                self.model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, UnicodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        """Return the URL of the next page, or None on the last page."""
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        cursor = self.encode_cursor(self.get_position(self.page[-1]))
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        """Wrap a page of serialized rows with the next cursor link."""
+        return Response({
+            'next': self.get_next_link(),
+            'results': data
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                    'description': 'URL of the next page, null on the last page'
+                },
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque pagination cursor taken from the "next" link',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Number of results per page (max {self.max_page_size})',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+class TrainingCursorPagination(KeysetPagination):
+    """Keyset pagination for trainings, newest first."""
+
+    ordering = ('-datetime', '-id')
+
+
+class ExerciseCursorPagination(KeysetPagination):
+    """Keyset pagination for exercises in creation order."""
+
+    ordering = ('id',)
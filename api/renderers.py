@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that encodes straight to bytes with orjson when it is installed.
+
+    Decimal, datetime and the other types DRF's encoder knows are converted by
+    that same encoder, so output is identical to JSONRenderer. Without orjson,
+    or when indentation is requested, it falls back to JSONRenderer.
+    """
+
+    def __init__(self):
+        self.default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+
+        # Match JSONRenderer, which escapes these to stay a strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renderer selected for newline-delimited JSON exports.
+
+    Export rows are streamed by the view itself; this renderer only takes part
+    in content negotiation and renders error responses as a single JSON line.
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data).encode(self.charset) + b'\n'
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renderer selected for CSV exports.
+
+    Export rows are streamed by the view itself; error responses are rendered
+    as a one-column CSV with the JSON-encoded error.
+    """
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['error'])
+        writer.writerow([json.dumps(data)])
+        return buffer.getvalue().encode(self.charset)
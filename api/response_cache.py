@@ -0,0 +1,171 @@
+import hashlib
+import threading
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from . import metrics
+from .caching import LRUCache
+from .conditional import get_data_version
+from .muscles import muscle_registry
+
+
+class LocalResponseStore:
+    """In-process LRU of rendered responses (per worker process)."""
+
+    def __init__(self, max_size=10000):
+        self._entries = LRUCache(max_size=max_size)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, value, timeout):
+        self._entries.set(key, value, expires_at=time.time() + timeout)
+
+    def add(self, key, value, timeout):
+        """Set ``key`` unless it is already present; return whether it was set."""
+        with self._lock:
+            if self._entries.get(key) is not None:
+                return False
+            self.set(key, value, timeout)
+            return True
+
+    def delete(self, key):
+        self._entries.delete(key)
+
+
+_local_store = LocalResponseStore(getattr(settings, 'RESPONSE_CACHE_SIZE', 10000))
+
+
+def get_response_store():
+    """
+    Return the Django cache named by RESPONSE_CACHE_ALIAS, else the in-process store.
+
+    Any Django cache backend works (locmem, file-based, Redis, Memcached); it
+    only needs get, set, add and delete.
+    """
+    alias = getattr(settings, 'RESPONSE_CACHE_ALIAS', None)
+    if alias:
+        return caches[alias]
+    return _local_store
+
+
+def get_ttl(endpoint):
+    """Seconds an endpoint's responses are cached; 0 disables caching for it."""
+    return getattr(settings, 'RESPONSE_CACHE_TTLS', {}).get(endpoint, 0)
+
+
+def get_cache_key(request, endpoint, kwargs):
+    """
+    Build the key of a response from the user, their data version and the request.
+
+    The data version is the per-user generation number bumped by every write,
+    so a write makes all of the user's earlier entries unreachable without
+    scanning for them. The muscle catalog version covers muscle names, and
+    relative periods are pinned to the current minute like the ETag.
+    """
+    version, _ = get_data_version(request)
+    query = sorted((name, request.query_params.getlist(name)) for name in request.query_params)
+    minute = int(timezone.now().timestamp() // 60) if request.query_params.get('period') else None
+    digest = hashlib.sha256(repr((
+        request.accepted_media_type,
+        sorted(kwargs.items()),
+        query,
+        minute,
+        muscle_registry.get_catalog().version,
+    )).encode('utf-8')).hexdigest()[:32]
+    return f'response:{endpoint}:{request.user.id}:{version}:{digest}'
+
+
+def wait_for_entry(store, key, lock_key):
+    """Poll for the entry being computed by another request for up to RESPONSE_CACHE_WAIT_TIMEOUT seconds."""
+    deadline = time.monotonic() + getattr(settings, 'RESPONSE_CACHE_WAIT_TIMEOUT', 5)
+    while time.monotonic() < deadline:
+        time.sleep(0.02)
+        entry = store.get(key)
+        if entry is not None:
+            return entry
+        if store.get(lock_key) is None:
+            # The other request finished without a cacheable response
+            return store.get(key)
+    return None
+
+
+def render(request, response):
+    """Render a DRF response so its bytes can be stored."""
+    if isinstance(response, Response):
+        view = request.parser_context['view']
+        context = request.parser_context
+        response = view.finalize_response(request, response, *context['args'], **context['kwargs'])
+        response.render()
+    return response
+
+
+def build_response(entry):
+    status_code, content_type, content = entry
+    return HttpResponse(content, status=status_code, content_type=content_type)
+
+
+def cached_response(endpoint):
+    """
+    Serve a per-user GET handler through the read-through response cache.
+
+    JSON responses with status 200 are stored for ``RESPONSE_CACHE_TTLS[endpoint]``
+    seconds, keyed by user, data version, endpoint and normalized query
+    parameters. Concurrent misses for the same key are coalesced: one request
+    computes the response while the others wait for it. Hits and misses are
+    counted in the ``response_cache`` metrics.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(*args, **kwargs):
+            request = next(arg for arg in args if isinstance(arg, Request))
+            ttl = get_ttl(endpoint)
+            if not ttl or not request.user.is_authenticated or request.accepted_renderer.format != 'json':
+                return view_method(*args, **kwargs)
+
+            store = get_response_store()
+            key = get_cache_key(request, endpoint, kwargs)
+            entry = store.get(key)
+            if entry is not None:
+                metrics.increment('response_cache', endpoint, hits=1)
+                return build_response(entry)
+
+            lock_key = f'{key}:lock'
+            lock_timeout = getattr(settings, 'RESPONSE_CACHE_LOCK_TIMEOUT', 30)
+            if not store.add(lock_key, 1, lock_timeout):
+                entry = wait_for_entry(store, key, lock_key)
+                if entry is not None:
+                    metrics.increment('response_cache', endpoint, hits=1, coalesced=1)
+                    return build_response(entry)
+                # Compute it here without taking over the other request's lock
+                lock_key = None
+
+            metrics.increment('response_cache', endpoint, misses=1)
+            try:
+                response = view_method(*args, **kwargs)
+                if response.status_code == 200 and not response.streaming:
+                    response = render(request, response)
+                    store.set(key, (response.status_code, response['Content-Type'], response.content), ttl)
+            finally:
+                if lock_key is not None:
+                    store.delete(lock_key)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def add_hit_ratios(snapshot):
+    """Add a ``hit_ratio`` to every endpoint of the response cache metrics in a snapshot."""
+    for counters in snapshot.get('response_cache', {}).values():
+        lookups = counters.get('hits', 0) + counters.get('misses', 0)
+        counters['hit_ratio'] = round(counters.get('hits', 0) / lookups, 4) if lookups else None
+    return snapshot
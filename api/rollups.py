@@ -0,0 +1,213 @@
+from datetime import datetime, timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, DecimalField, F, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .filters import get_period_bounds
+from .models import TrainingRollup
+
+
+GRANULARITIES = ['day', 'week', 'month']
+
+TRUNC_FUNCTIONS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+VOLUME_OUTPUT_FIELD = DecimalField(max_digits=14, decimal_places=2)
+
+
+def get_bucket_start(value, granularity):
+    """Return the first day of the day/week/month bucket containing a datetime."""
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).date()
+
+    if granularity == 'week':
+        # Weeks start on Monday, like the current_week history period
+        return value - timedelta(days=value.weekday())
+    if granularity == 'month':
+        return value.replace(day=1)
+    return value
+
+
+def get_training_volume(training):
+    """Return the volume (weight x sets x repetitions) of a training."""
+    return training.weight * training.sets * training.repetitions
+
+
+def get_rollup_keys(training):
+    """Yield the day, week and month rollup keys of a training."""
+    for granularity in GRANULARITIES:
+        yield (
+            training.user_id,
+            training.exercise_id,
+            granularity,
+            get_bucket_start(training.datetime, granularity),
+        )
+
+
+def apply_delta(key, volume, sessions):
+    """Add a volume and session delta to one rollup row, creating or deleting it as needed."""
+    user_id, exercise_id, granularity, bucket_start = key
+    lookup = {
+        'user_id': user_id,
+        'exercise_id': exercise_id,
+        'granularity': granularity,
+        'bucket_start': bucket_start,
+    }
+    rollups = TrainingRollup.objects.filter(**lookup)
+    updated = rollups.update(volume=F('volume') + volume, sessions=F('sessions') + sessions)
+
+    if sessions < 0:
+        rollups.filter(sessions__lte=0).delete()
+    elif not updated:
+        try:
+            with transaction.atomic():
+                TrainingRollup.objects.create(volume=volume, sessions=sessions, **lookup)
+        except IntegrityError:
+            # A concurrent write created the bucket first
+            rollups.update(volume=F('volume') + volume, sessions=F('sessions') + sessions)
+
+
+def apply_training(training, sign=1):
+    """
+    Add (sign=1) or remove (sign=-1) a training from its day, week and month
+    rollup rows.
+    """
+    volume = get_training_volume(training) * sign
+
+    with transaction.atomic():
+        for key in get_rollup_keys(training):
+            apply_delta(key, volume, sign)
+
+
+def apply_trainings(trainings):
+    """
+    Add a batch of newly created trainings to their rollup rows with one
+    locking read, one bulk update and one bulk insert.
+    """
+    deltas = {}
+    for training in trainings:
+        volume = get_training_volume(training)
+        for key in get_rollup_keys(training):
+            delta = deltas.setdefault(key, [0, 0])
+            delta[0] += volume
+            delta[1] += 1
+
+    with transaction.atomic():
+        existing = TrainingRollup.objects.select_for_update().filter(
+            user_id__in={key[0] for key in deltas},
+            exercise_id__in={key[1] for key in deltas},
+            bucket_start__in={key[3] for key in deltas}
+        )
+        rows = {
+            (rollup.user_id, rollup.exercise_id, rollup.granularity, rollup.bucket_start): rollup
+            for rollup in existing
+        }
+
+        changed = []
+        missing = {}
+        for key, (volume, sessions) in deltas.items():
+            rollup = rows.get(key)
+            if rollup is None:
+                missing[key] = TrainingRollup(
+                    user_id=key[0],
+                    exercise_id=key[1],
+                    granularity=key[2],
+                    bucket_start=key[3],
+                    volume=volume,
+                    sessions=sessions
+                )
+                continue
+            rollup.volume += volume
+            rollup.sessions += sessions
+            changed.append(rollup)
+
+        if changed:
+            TrainingRollup.objects.bulk_update(changed, ['volume', 'sessions'])
+        if missing:
+            try:
+                with transaction.atomic():
+                    TrainingRollup.objects.bulk_create(missing.values())
+            except IntegrityError:
+                # A concurrent write created some of the buckets first
+                for key, rollup in missing.items():
+                    apply_delta(key, rollup.volume, rollup.sessions)
+
+
+def compute_rollups(queryset, granularity):
+    """Aggregate a Training (or ArchivedTraining) queryset into rollup rows for one granularity."""
+    trunc = TRUNC_FUNCTIONS[granularity]
+
+    return (
+        queryset
+        .order_by()
+        .annotate(bucket_start=trunc('datetime', output_field=DateField()))
+        .values('user_id', 'exercise_id', 'bucket_start')
+        .annotate(
+            volume=Sum(
+                F('weight') * F('sets') * F('repetitions'),
+                output_field=VOLUME_OUTPUT_FIELD
+            ),
+            sessions=Count('id')
+        )
+    )
+
+
+def merge_rollups(*row_sets):
+    """Sum rollup rows of the same user, exercise and bucket computed from the hot and archived trainings."""
+    merged = {}
+    for rows in row_sets:
+        for row in rows:
+            key = (row['user_id'], row['exercise_id'], row['bucket_start'])
+            current = merged.get(key)
+            if current is None:
+                merged[key] = dict(row)
+            else:
+                current['volume'] += row['volume']
+                current['sessions'] += row['sessions']
+    return list(merged.values())
+
+
+def read_rollups(user, granularity, period=None, exercise_id=None, muscle_id=None, group_by='exercise'):
+    """
+    Read rollup rows for a user, optionally narrowed to a history period.
+
+    Rows carry ``muscle_id`` only; serializers resolve the muscle name from the
+    muscle registry.
+    """
+    queryset = TrainingRollup.objects.filter(user=user, granularity=granularity)
+
+    # Buckets that overlap the period are returned whole
+    bounds = get_period_bounds(period)
+    if bounds is not None:
+        start, end = bounds
+        queryset = queryset.filter(bucket_start__gte=get_bucket_start(start, granularity))
+        if end is not None:
+            queryset = queryset.filter(bucket_start__lte=timezone.localtime(end).date())
+
+    if exercise_id:
+        queryset = queryset.filter(exercise_id=exercise_id)
+
+    if muscle_id:
+        queryset = queryset.filter(exercise__muscle_id=muscle_id)
+
+    if group_by == 'muscle':
+        return (
+            queryset
+            .values('granularity', 'bucket_start', muscle_id=F('exercise__muscle_id'))
+            .annotate(volume=Sum('volume'), sessions=Sum('sessions'))
+            .order_by('bucket_start', 'muscle_id')
+        )
+
+    return queryset.values(
+        'granularity',
+        'bucket_start',
+        'exercise_id',
+        'volume',
+        'sessions',
+        exercise_name=F('exercise__name'),
+        muscle_id=F('exercise__muscle_id')
+    ).order_by('bucket_start', 'exercise_id')
@@ -1,7 +1,23 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
 from .models import User, Muscle, Exercise, Training
+from .muscles import muscle_registry
+
+
+class DynamicFieldsMixin:
+    """Serializer mixin that accepts a ``fields`` argument to limit the output fields."""
+    
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -74,6 +90,24 @@ class UserLoginSerializer(serializers.Serializer):
     )
 
 
+class TokenRefreshSerializer(serializers.Serializer):
+    """Serializer for exchanging a refresh token for a new token pair."""
+    
+    refresh = serializers.CharField(
+        required=True,
+        help_text="Refresh token returned by login or the previous refresh"
+    )
+
+
+class LogoutSerializer(serializers.Serializer):
+    """Serializer for logging out, optionally revoking a refresh token as well."""
+    
+    refresh = serializers.CharField(
+        required=False,
+        help_text="Refresh token to revoke together with the current access token"
+    )
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for user details."""
     
@@ -83,6 +117,14 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'date_joined']
 
 
+@extend_schema_field(OpenApiTypes.STR)
+class MuscleNameField(serializers.ReadOnlyField):
+    """Muscle name looked up in the in-process muscle registry from a muscle ID source."""
+    
+    def to_representation(self, value):
+        return muscle_registry.get_name(value)
+
+
 class MuscleSerializer(serializers.ModelSerializer):
     """Serializer for muscle groups."""
     
@@ -91,10 +133,10 @@ class MuscleSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
 
 
-class ExerciseSerializer(serializers.ModelSerializer):
+class ExerciseSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for exercises."""
     
-    muscle_name = serializers.CharField(source='muscle.name', read_only=True)
+    muscle_name = MuscleNameField(source='muscle_id')
     
     class Meta:
         model = Exercise
@@ -128,11 +170,26 @@ class ExerciseSerializer(serializers.ModelSerializer):
         return data
 
 
-class TrainingSerializer(serializers.ModelSerializer):
+class ExerciseBulkItemSerializer(ExerciseSerializer):
+    """
+    Input serializer for one entry of a bulk exercise upsert.
+    
+    The muscle is taken as a plain ID and there is no uniqueness pre-check:
+    the view validates muscles with one query and relies on the
+    (user, muscle, name) unique constraint when writing.
+    """
+    
+    muscle = serializers.IntegerField()
+    
+    def validate(self, data):
+        return data
+
+
+class TrainingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for training sessions."""
     
     exercise_name = serializers.CharField(source='exercise.name', read_only=True)
-    muscle_name = serializers.CharField(source='exercise.muscle.name', read_only=True)
+    muscle_name = MuscleNameField(source='exercise.muscle_id')
     
     class Meta:
         model = Training
@@ -165,13 +222,69 @@ class TrainingSerializer(serializers.ModelSerializer):
         return value
 
 
+class TrainingBulkItemSerializer(TrainingSerializer):
+    """
+    Input serializer for one entry of a bulk training log.
+    
+    The exercise is taken as a plain ID; ownership of all entries is checked
+    by the view with a single query.
+    """
+    
+    exercise = serializers.IntegerField()
+    
+    def validate_exercise(self, value):
+        return value
+
+
+class SyncRequestSerializer(serializers.Serializer):
+    """Serializer for a delta-sync request: the last cursor plus queued local changes."""
+    
+    cursor = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        min_value=0,
+        help_text="Cursor returned by the previous sync; omit or null for a full sync"
+    )
+    exercises = serializers.ListField(
+        child=serializers.JSONField(),
+        required=False,
+        default=list,
+        help_text="Exercise changes: id or client_id, muscle, name, note, or deleted: true"
+    )
+    trainings = serializers.ListField(
+        child=serializers.JSONField(),
+        required=False,
+        default=list,
+        help_text="Training changes: id or client_id, exercise or exercise_client_id, weight, sets, repetitions, optional datetime, or deleted: true"
+    )
+    
+    def validate(self, data):
+        max_changes = getattr(settings, 'SYNC_MAX_CHANGES', 1000)
+        if len(data['exercises']) + len(data['trainings']) > max_changes:
+            raise serializers.ValidationError(f'At most {max_changes} changes can be sent at once.')
+        return data
+
+
 class TrainingStatsSerializer(serializers.Serializer):
     """Serializer for training statistics."""
     
     exercise_id = serializers.IntegerField()
     exercise_name = serializers.CharField()
-    muscle_name = serializers.CharField()
+    muscle_name = MuscleNameField(source='muscle_id')
     low_weight = serializers.DecimalField(max_digits=6, decimal_places=2)
     high_weight = serializers.DecimalField(max_digits=6, decimal_places=2)
     last_weight = serializers.DecimalField(max_digits=6, decimal_places=2)
     total_sessions = serializers.IntegerField()
+
+
+class TrainingRollupSerializer(serializers.Serializer):
+    """Serializer for time-bucketed training volume rollups."""
+    
+    granularity = serializers.CharField()
+    bucket_start = serializers.DateField()
+    exercise_id = serializers.IntegerField(required=False)
+    exercise_name = serializers.CharField(required=False)
+    muscle_id = serializers.IntegerField()
+    muscle_name = MuscleNameField(source='muscle_id')
+    volume = serializers.DecimalField(max_digits=14, decimal_places=2)
+    sessions = serializers.IntegerField()
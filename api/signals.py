@@ -0,0 +1,72 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .authentication import user_cache
+from .changes import record_change, record_object_changes
+from .conditional import bump_data_version
+from .models import User, Muscle, Exercise, Training, ArchivedTraining
+from .muscles import muscle_registry
+
+
+def is_deleted_with(origin, model):
+    """Return whether a delete signal comes from deleting ``model`` rows (an instance or a queryset)."""
+    return isinstance(origin, model) or getattr(origin, 'model', None) is model
+
+
+@receiver(post_save, sender=Exercise)
+@receiver(post_delete, sender=Exercise)
+@receiver(post_save, sender=Training)
+@receiver(post_delete, sender=Training)
+def exercise_or_training_changed(sender, instance, origin=None, **kwargs):
+    """Bump the owner's data version, which keys ETags and cached responses, whenever an exercise or training changes."""
+    # A deleted exercise bumps the version once for all of its trainings
+    if sender is Training and is_deleted_with(origin, Exercise):
+        return
+    bump_data_version(instance.user_id)
+
+
+@receiver(post_save, sender=Exercise)
+@receiver(post_save, sender=Training)
+def exercise_or_training_saved(sender, instance, **kwargs):
+    """Log a created or updated exercise or training for delta sync."""
+    record_change(instance, 'upsert')
+
+
+@receiver(pre_delete, sender=Exercise)
+def exercise_deleting(sender, instance, origin=None, **kwargs):
+    """Remember the trainings, hot and archived, that an exercise delete cascades to."""
+    if is_deleted_with(origin, User):
+        return
+    instance._cascaded_training_ids = (
+        list(Training.objects.filter(exercise=instance).order_by().values_list('id', flat=True))
+        + list(ArchivedTraining.objects.filter(exercise=instance).order_by().values_list('id', flat=True))
+    )
+
+
+@receiver(post_delete, sender=Exercise)
+@receiver(post_delete, sender=Training)
+def exercise_or_training_deleted(sender, instance, origin=None, **kwargs):
+    """Leave a delta-sync tombstone for a deleted exercise or training."""
+    # Everything of a deleted user goes away, including the change log
+    if is_deleted_with(origin, User):
+        return
+    # Trainings of a deleted exercise are logged together with it below
+    if sender is Training and is_deleted_with(origin, Exercise):
+        return
+    record_change(instance, 'delete')
+    if sender is Exercise:
+        record_object_changes(instance.user_id, 'training', getattr(instance, '_cascaded_training_ids', []), 'delete')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Drop a saved or deleted user from the authentication cache."""
+    user_cache.invalidate(instance.id)
+
+
+@receiver(post_save, sender=Muscle)
+@receiver(post_delete, sender=Muscle)
+def muscle_changed(sender, instance, **kwargs):
+    """Reload the muscle registry after an admin edit of the catalog."""
+    muscle_registry.invalidate()
@@ -0,0 +1,185 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Subquery
+
+from .models import ArchivedTraining, ExerciseStats, Training
+
+
+STATS_FIELDS = [
+    'low_weight',
+    'high_weight',
+    'last_weight',
+    'last_datetime',
+    'total_sessions',
+]
+
+
+def compute_exercise_stats(queryset):
+    """
+    Compute low, high and last weight plus session count for every exercise
+    in a Training (or ArchivedTraining) queryset using a single grouped query.
+    """
+    last_weight = queryset.model.objects.filter(
+        user_id=OuterRef('user_id'),
+        exercise_id=OuterRef('exercise_id')
+    ).order_by('-datetime', '-id').values('weight')[:1]
+
+    return (
+        queryset
+        .order_by()
+        .values('user_id', 'exercise_id')
+        .annotate(
+            exercise_name=F('exercise__name'),
+            muscle_id=F('exercise__muscle_id'),
+            low_weight=Min('weight'),
+            high_weight=Max('weight'),
+            last_weight=Subquery(last_weight),
+            last_datetime=Max('datetime'),
+            total_sessions=Count('id')
+        )
+        .values(
+            'user_id',
+            'exercise_id',
+            'exercise_name',
+            'muscle_id',
+            *STATS_FIELDS
+        )
+        .order_by('exercise_id')
+    )
+
+
+def merge_exercise_stats(*row_sets):
+    """
+    Combine stats rows computed separately from the hot and the archived
+    trainings into one row per user and exercise.
+    """
+    merged = {}
+    for rows in row_sets:
+        for row in rows:
+            key = (row['user_id'], row['exercise_id'])
+            current = merged.get(key)
+            if current is None:
+                merged[key] = dict(row)
+                continue
+            current['low_weight'] = min(current['low_weight'], row['low_weight'])
+            current['high_weight'] = max(current['high_weight'], row['high_weight'])
+            current['total_sessions'] += row['total_sessions']
+            if row['last_datetime'] > current['last_datetime']:
+                current['last_weight'] = row['last_weight']
+                current['last_datetime'] = row['last_datetime']
+    return [merged[key] for key in sorted(merged)]
+
+
+def read_exercise_stats(user, exercise_id=None, muscle_id=None):
+    """Read materialized stats rows for a user in TrainingStatsSerializer shape."""
+    queryset = ExerciseStats.objects.filter(user=user)
+
+    if exercise_id:
+        queryset = queryset.filter(exercise_id=exercise_id)
+
+    if muscle_id:
+        queryset = queryset.filter(exercise__muscle_id=muscle_id)
+
+    # muscle_name is resolved from the muscle registry by the serializer
+    return queryset.values(
+        'exercise_id',
+        *STATS_FIELDS,
+        exercise_name=F('exercise__name'),
+        muscle_id=F('exercise__muscle_id')
+    ).order_by('exercise_id')
+
+
+def fold_training(stats, training):
+    """Merge one training into a stats row in memory."""
+    stats.low_weight = min(stats.low_weight, training.weight)
+    stats.high_weight = max(stats.high_weight, training.weight)
+    if training.datetime >= stats.last_datetime:
+        stats.last_weight = training.weight
+        stats.last_datetime = training.datetime
+    stats.total_sessions += 1
+
+
+def record_training(training):
+    """Fold a newly created training into its ExerciseStats row."""
+    with transaction.atomic():
+        stats, created = ExerciseStats.objects.select_for_update().get_or_create(
+            user_id=training.user_id,
+            exercise_id=training.exercise_id,
+            defaults={
+                'low_weight': training.weight,
+                'high_weight': training.weight,
+                'last_weight': training.weight,
+                'last_datetime': training.datetime,
+                'total_sessions': 1,
+            }
+        )
+        if created:
+            return stats
+
+        fold_training(stats, training)
+        stats.save(update_fields=STATS_FIELDS)
+        return stats
+
+
+def record_trainings(trainings):
+    """
+    Fold a batch of newly created trainings into their ExerciseStats rows
+    with one locking read, one bulk update and one bulk insert.
+    """
+    with transaction.atomic():
+        existing = ExerciseStats.objects.select_for_update().filter(
+            user_id__in={training.user_id for training in trainings},
+            exercise_id__in={training.exercise_id for training in trainings}
+        )
+        rows = {(stats.user_id, stats.exercise_id): stats for stats in existing}
+
+        changed = {}
+        missing = {}
+        for training in trainings:
+            key = (training.user_id, training.exercise_id)
+            if key in rows:
+                fold_training(rows[key], training)
+                changed[key] = rows[key]
+            elif key in missing:
+                fold_training(missing[key], training)
+            else:
+                missing[key] = ExerciseStats(
+                    user_id=training.user_id,
+                    exercise_id=training.exercise_id,
+                    low_weight=training.weight,
+                    high_weight=training.weight,
+                    last_weight=training.weight,
+                    last_datetime=training.datetime,
+                    total_sessions=1
+                )
+
+        if changed:
+            ExerciseStats.objects.bulk_update(changed.values(), STATS_FIELDS)
+        if missing:
+            try:
+                with transaction.atomic():
+                    ExerciseStats.objects.bulk_create(missing.values())
+            except IntegrityError:
+                # A concurrent write created some of the rows first
+                for user_id, exercise_id in missing:
+                    refresh_exercise_stats(user_id, exercise_id)
+
+
+def refresh_exercise_stats(user_id, exercise_id):
+    """Recompute the ExerciseStats row of one exercise from its trainings."""
+    with transaction.atomic():
+        rows = merge_exercise_stats(
+            compute_exercise_stats(Training.objects.filter(user_id=user_id, exercise_id=exercise_id)),
+            compute_exercise_stats(ArchivedTraining.objects.filter(user_id=user_id, exercise_id=exercise_id))
+        )
+        row = rows[0] if rows else None
+
+        if row is None:
+            ExerciseStats.objects.filter(user_id=user_id, exercise_id=exercise_id).delete()
+            return None
+
+        stats, _ = ExerciseStats.objects.update_or_create(
+            user_id=user_id,
+            exercise_id=exercise_id,
+            defaults={field: row[field] for field in STATS_FIELDS}
+        )
+        return stats
@@ -0,0 +1,253 @@
+from django.db import IntegrityError, models, transaction
+from rest_framework import serializers
+
+from .archive import restore_from_archive
+from .changes import read_changes
+from .fast_serializers import FastExerciseSerializer, FastTrainingSerializer
+from .models import ArchivedTraining, Exercise, Training
+from .serializers import ExerciseSerializer, TrainingSerializer
+from .trainings import create_training, delete_training, update_training
+
+
+def uuid_converter():
+    def convert(value):
+        return str(value) if value is not None else None
+    return convert
+
+
+class SyncExerciseSerializer(FastExerciseSerializer):
+    """Exercise rows of the sync feed, including the client-generated ID."""
+
+    fields = FastExerciseSerializer.fields + (('client_id', 'client_id', uuid_converter),)
+
+
+class SyncTrainingSerializer(FastTrainingSerializer):
+    """Training rows of the sync feed, including the client-generated ID."""
+
+    fields = FastTrainingSerializer.fields + (('client_id', 'client_id', uuid_converter),)
+
+
+class ChangeApplier:
+    """
+    Apply one client change to an exercise or training.
+
+    A change addresses its object by server ``id`` or by ``client_id``; an
+    unknown ``client_id`` creates the object with that ID, so replaying a
+    change is harmless. ``deleted: true`` deletes the object (a no-op when it
+    is already gone); ``deleted`` must be a JSON boolean. Returns
+    ``{'id', 'client_id', 'status'}`` or raises ValidationError.
+    """
+
+    model = None
+    serializer_class = None
+    writable_fields = ()
+
+    def __init__(self, request):
+        self.request = request
+        self.user = request.user
+
+    def get_object(self, object_id, client_id):
+        queryset = self.model.objects.filter(user=self.user)
+        if object_id is not None:
+            return queryset.filter(id=object_id).first()
+        if client_id is not None:
+            return queryset.filter(client_id=client_id).first()
+        raise serializers.ValidationError({'client_id': ['Either id or client_id is required.']})
+
+    def get_data(self, change):
+        return {field: change[field] for field in self.writable_fields if field in change}
+
+    def apply(self, change):
+        if not isinstance(change, dict):
+            raise serializers.ValidationError({'non_field_errors': ['Expected an object.']})
+
+        object_id = self.parse_id(change)
+        client_id = self.parse_uuid(change, 'client_id')
+        deleted = self.parse_deleted(change)
+
+        instance = self.get_object(object_id, client_id)
+        if deleted:
+            if instance is None:
+                return self.result(object_id, client_id, 'deleted')
+            result = self.result(instance.id, instance.client_id, 'deleted')
+            self.delete(instance)
+            return result
+
+        if instance is None and object_id is not None:
+            raise serializers.ValidationError({'id': ['Object not found.']})
+
+        serializer = self.serializer_class(
+            instance,
+            data=self.get_data(change),
+            context={'request': self.request}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        if instance is None:
+            instance = self.create(serializer, change, client_id)
+            return self.result(instance.id, client_id, 'created')
+
+        if not self.has_changes(instance, serializer.validated_data):
+            return self.result(instance.id, instance.client_id, 'unchanged')
+
+        instance = self.update(serializer)
+        return self.result(instance.id, instance.client_id, 'updated')
+
+    def parse_id(self, change):
+        if change.get('id') is None:
+            return None
+        try:
+            return serializers.IntegerField(min_value=1, max_value=2 ** 63 - 1).run_validation(change['id'])
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({'id': exc.detail})
+
+    def parse_deleted(self, change):
+        # Strings such as "false" are truthy, so only JSON booleans are accepted
+        deleted = change.get('deleted')
+        if deleted is not None and not isinstance(deleted, bool):
+            raise serializers.ValidationError({'deleted': ['Must be a boolean.']})
+        return deleted is True
+
+    def parse_uuid(self, change, field):
+        if change.get(field) is None:
+            return None
+        try:
+            return serializers.UUIDField().run_validation(change[field])
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({field: exc.detail})
+
+    def has_changes(self, instance, validated_data):
+        for field, value in validated_data.items():
+            # Compare foreign keys by ID so the related object is not loaded
+            if isinstance(value, models.Model):
+                if getattr(instance, f'{field}_id') != value.pk:
+                    return True
+            elif getattr(instance, field) != value:
+                return True
+        return False
+
+    def result(self, object_id, client_id, status):
+        return {
+            'id': object_id,
+            'client_id': str(client_id) if client_id is not None else None,
+            'status': status,
+        }
+
+    def create(self, serializer, change, client_id):
+        return serializer.save(user=self.user, client_id=client_id)
+
+    def update(self, serializer):
+        return serializer.save()
+
+    def delete(self, instance):
+        instance.delete()
+
+
+class ExerciseChangeApplier(ChangeApplier):
+    model = Exercise
+    serializer_class = ExerciseSerializer
+    writable_fields = ('muscle', 'name', 'note')
+
+
+class TrainingChangeApplier(ChangeApplier):
+    """
+    Trainings reference their exercise by ``exercise`` (server ID) or by
+    ``exercise_client_id``, and may carry the ``datetime`` they were logged at
+    offline when they are created.
+    """
+
+    model = Training
+    serializer_class = TrainingSerializer
+    writable_fields = ('exercise', 'weight', 'sets', 'repetitions')
+
+    def get_object(self, object_id, client_id):
+        instance = super().get_object(object_id, client_id)
+        if instance is not None:
+            return instance
+        # Archived trainings go back to the training table before they change
+        lookup = {'id': object_id} if object_id is not None else {'client_id': client_id}
+        if restore_from_archive(self.user, **lookup):
+            return super().get_object(object_id, client_id)
+        return None
+
+    def get_data(self, change):
+        data = super().get_data(change)
+        exercise_client_id = self.parse_uuid(change, 'exercise_client_id')
+        if 'exercise' not in data and exercise_client_id is not None:
+            exercise_id = (
+                Exercise.objects
+                .filter(user=self.user, client_id=exercise_client_id)
+                .values_list('id', flat=True)
+                .first()
+            )
+            if exercise_id is None:
+                raise serializers.ValidationError({'exercise_client_id': ['Exercise not found.']})
+            data['exercise'] = exercise_id
+        return data
+
+    def create(self, serializer, change, client_id):
+        datetime = None
+        if change.get('datetime') is not None:
+            try:
+                datetime = serializers.DateTimeField().run_validation(change['datetime'])
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError({'datetime': exc.detail})
+        return create_training(serializer, self.user, datetime=datetime, client_id=client_id)
+
+    def update(self, serializer):
+        return update_training(serializer)
+
+    def delete(self, instance):
+        delete_training(instance)
+
+
+def apply_changes(applier, changes):
+    """Apply a list of changes, each in its own savepoint, and collect results and errors."""
+    results = []
+    errors = []
+    for index, change in enumerate(changes):
+        try:
+            with transaction.atomic():
+                results.append(applier.apply(change))
+        except serializers.ValidationError as exc:
+            errors.append({'index': index, 'errors': exc.detail})
+        except IntegrityError:
+            # A concurrent request applied the same client_id first
+            errors.append({'index': index, 'errors': {'client_id': ['Conflicting concurrent change, please retry.']}})
+    return results, errors
+
+
+def build_delta(user, cursor, limit):
+    """Read the exercises and trainings changed after ``cursor`` plus tombstones of deleted ones."""
+    entries, next_cursor, has_more = read_changes(user, cursor, limit)
+
+    upserted = {'exercise': [], 'training': []}
+    deleted = {'exercise': [], 'training': []}
+    for _, model, object_id, action in entries:
+        (deleted if action == 'delete' else upserted)[model].append(object_id)
+
+    exercises = []
+    if upserted['exercise']:
+        queryset = Exercise.objects.filter(user=user, id__in=upserted['exercise']).order_by('id')
+        exercises = SyncExerciseSerializer.serialize(SyncExerciseSerializer.get_queryset(queryset))
+
+    trainings = []
+    if upserted['training']:
+        queryset = Training.objects.filter(user=user, id__in=upserted['training']).order_by('id')
+        trainings = SyncTrainingSerializer.serialize(SyncTrainingSerializer.get_queryset(queryset))
+        if len(trainings) < len(upserted['training']):
+            # The rest may have been moved to the archive since they changed
+            queryset = ArchivedTraining.objects.filter(user=user, id__in=upserted['training']).order_by('id')
+            trainings += SyncTrainingSerializer.serialize(SyncTrainingSerializer.get_queryset(queryset))
+            trainings.sort(key=lambda training: training['id'])
+
+    return {
+        'cursor': next_cursor,
+        'has_more': has_more,
+        'exercises': exercises,
+        'trainings': trainings,
+        'deleted': {
+            'exercises': deleted['exercise'],
+            'trainings': deleted['training'],
+        },
+    }
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.authentication import generate_jwt_token
+from api.models import ArchivedTraining, ChangeLog, Exercise, ExerciseStats, Muscle, Training, User
+
+
+# The in-process response cache would outlive each test's rolled-back data
+@override_settings(RESPONSE_CACHE_TTLS={})
+class ArchivedTrainingTests(APITestCase):
+    """Archived trainings stay readable and writable through the training endpoints and sync."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='lifter@example.com', password='Secret123!x', username='lifter', first_name='Lift', last_name='Er'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+        muscle = Muscle.objects.create(name='legs')
+        self.exercise = Exercise.objects.create(user=self.user, muscle=muscle, name='Squat')
+        for weight in ('100.00', '110.00', '120.00'):
+            response = self.client.post(
+                '/api/trainings/',
+                {'exercise': self.exercise.id, 'weight': weight, 'sets': 3, 'repetitions': 5},
+                format='json'
+            )
+            self.assertEqual(response.status_code, 201)
+
+        self.old = Training.objects.order_by('id').first()
+        self.old_datetime = timezone.now() - timedelta(days=500)
+        Training.objects.filter(id=self.old.id).update(datetime=self.old_datetime)
+        call_command('archive_trainings', stdout=StringIO())
+        self.assertTrue(ArchivedTraining.objects.filter(id=self.old.id).exists())
+        self.assertFalse(Training.objects.filter(id=self.old.id).exists())
+
+    def url(self, training_id):
+        return f'/api/trainings/{training_id}/'
+
+    def test_list_includes_archived_trainings(self):
+        response = self.client.get('/api/trainings/')
+        self.assertEqual([training['id'] for training in response.json()][-1], self.old.id)
+        self.assertEqual(len(response.json()), 3)
+
+    def test_retrieve_reads_archive_in_place(self):
+        response = self.client.get(self.url(self.old.id))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['weight'], '100.00')
+        self.assertTrue(ArchivedTraining.objects.filter(id=self.old.id).exists())
+
+    def test_update_restores_training(self):
+        response = self.client.patch(self.url(self.old.id), {'weight': '90.00'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(ArchivedTraining.objects.filter(id=self.old.id).exists())
+        training = Training.objects.get(id=self.old.id)
+        self.assertEqual(training.datetime, self.old_datetime)
+        self.assertEqual(str(training.weight), '90.00')
+        stats = ExerciseStats.objects.get(exercise=self.exercise)
+        self.assertEqual((str(stats.low_weight), stats.total_sessions), ('90.00', 3))
+
+    def test_delete_removes_archived_training(self):
+        response = self.client.delete(self.url(self.old.id))
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(ArchivedTraining.objects.filter(id=self.old.id).exists())
+        self.assertFalse(Training.objects.filter(id=self.old.id).exists())
+        self.assertEqual(len(self.client.get('/api/trainings/').json()), 2)
+        self.assertEqual(ExerciseStats.objects.get(exercise=self.exercise).total_sessions, 2)
+        self.assertTrue(ChangeLog.objects.filter(model='training', object_id=self.old.id, action='delete').exists())
+
+    def test_unknown_training_is_not_found(self):
+        self.assertEqual(self.client.delete(self.url(999999)).status_code, 404)
+        self.assertEqual(self.client.get(self.url(999999)).status_code, 404)
+
+    def test_sync_delete_removes_archived_training(self):
+        response = self.client.post(
+            '/api/sync/',
+            {'trainings': [{'id': self.old.id, 'deleted': True}]},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results']['trainings'][0]['status'], 'deleted')
+        self.assertFalse(ArchivedTraining.objects.filter(id=self.old.id).exists())
+        self.assertNotIn(self.old.id, [training['id'] for training in self.client.get('/api/trainings/').json()])
@@ -0,0 +1,74 @@
+from rest_framework.test import APITestCase
+
+from api.authentication import generate_jwt_token
+from api.models import Exercise, Muscle, User
+
+
+class ExerciseBulkTests(APITestCase):
+    """POST /api/exercises/bulk/ matches names like the database collation and keeps omitted notes."""
+
+    url = '/api/exercises/bulk/'
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='lifter@example.com', password='Secret123!x', username='lifter', first_name='Lift', last_name='Er'
+        )
+        self.muscle = Muscle.objects.create(name='chest')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+
+    def bulk(self, items):
+        return self.client.post(self.url, items, format='json')
+
+    def test_case_variants_in_one_request_are_duplicates(self):
+        response = self.bulk([
+            {'muscle': self.muscle.id, 'name': 'Bench'},
+            {'muscle': self.muscle.id, 'name': 'bench'},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('name', response.data[1])
+        self.assertFalse(Exercise.objects.exists())
+
+    def test_case_variant_matches_existing_exercise(self):
+        exercise = Exercise.objects.create(user=self.user, muscle=self.muscle, name='Bench', note='flat')
+
+        response = self.bulk([{'muscle': self.muscle.id, 'name': 'bench', 'note': 'incline'}])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.data['updated']], [exercise.id])
+        exercise.refresh_from_db()
+        self.assertEqual((exercise.name, exercise.note), ('Bench', 'incline'))
+        self.assertEqual(Exercise.objects.count(), 1)
+
+    def test_accent_variant_matches_existing_exercise(self):
+        exercise = Exercise.objects.create(user=self.user, muscle=self.muscle, name='Développé', note='flat')
+
+        response = self.bulk([{'muscle': self.muscle.id, 'name': 'developpe', 'note': 'flat'}])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.data['unchanged']], [exercise.id])
+
+    def test_omitted_note_keeps_stored_note(self):
+        exercise = Exercise.objects.create(user=self.user, muscle=self.muscle, name='Bench', note='flat')
+
+        response = self.bulk([
+            {'muscle': self.muscle.id, 'name': 'Bench'},
+            {'muscle': self.muscle.id, 'name': 'Fly'},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.data['unchanged']], [exercise.id])
+        self.assertEqual([item['name'] for item in response.data['created']], ['Fly'])
+        exercise.refresh_from_db()
+        self.assertEqual(exercise.note, 'flat')
+
+    def test_explicit_null_note_clears_it(self):
+        exercise = Exercise.objects.create(user=self.user, muscle=self.muscle, name='Bench', note='flat')
+
+        response = self.bulk([{'muscle': self.muscle.id, 'name': 'Bench', 'note': None}])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.data['updated']], [exercise.id])
+        exercise.refresh_from_db()
+        self.assertIsNone(exercise.note)
@@ -0,0 +1,59 @@
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.authentication import generate_jwt_token
+from api.fast_serializers import FastExerciseSerializer, FastTrainingSerializer
+from api.management.seed import seed_user
+from api.models import Exercise, Training
+from api.serializers import ExerciseSerializer, TrainingSerializer
+
+
+@override_settings(RESPONSE_CACHE_TTLS={})
+class FastSerializerTests(TestCase):
+    """The values_list fast read path renders the same JSON as the DRF serializers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = seed_user('fast-serializer', 200, exercises_per_muscle=3)
+        exercise = Exercise.objects.filter(user=cls.user).first()
+        exercise.note = 'Keep elbows in'
+        exercise.save()
+        cls.muscle_id = exercise.muscle_id
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+
+    def assertSameJSON(self, queryset, serializer_class, fast_serializer_class):
+        renderer = JSONRenderer()
+        drf = renderer.render(serializer_class(queryset.all(), many=True).data)
+        fast = renderer.render(fast_serializer_class.serialize(fast_serializer_class.get_queryset(queryset.all())))
+        self.assertEqual(fast, drf)
+
+    def test_training_serializer(self):
+        trainings = Training.objects.filter(user=self.user).select_related('exercise')
+        self.assertSameJSON(trainings, TrainingSerializer, FastTrainingSerializer)
+
+    def test_exercise_serializer(self):
+        self.assertSameJSON(Exercise.objects.filter(user=self.user), ExerciseSerializer, FastExerciseSerializer)
+
+    def test_endpoints(self):
+        urls = [
+            '/api/trainings/',
+            '/api/trainings/history/',
+            f'/api/trainings/history/?muscle={self.muscle_id}',
+            '/api/trainings/history/?page_size=25',
+            '/api/trainings/history/?fields=id,exercise_name,weight,datetime',
+            '/api/exercises/',
+            f'/api/exercises/?muscle={self.muscle_id}&fields=id,name,note',
+            '/api/exercises/?page_size=5',
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                with override_settings(FAST_READ_SERIALIZERS=False):
+                    drf = self.client.get(url)
+                with override_settings(FAST_READ_SERIALIZERS=True):
+                    fast = self.client.get(url)
+                self.assertEqual(drf.status_code, 200)
+                self.assertEqual(fast.content, drf.content)
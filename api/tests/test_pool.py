@@ -0,0 +1,136 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+from api.db.pool import ConnectionPool, PoolTimeout, PooledDatabaseWrapperMixin, get_pool_stats
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """Checkout and return of pooled connections against a throwaway SQLite file."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'pool.sqlite3')
+
+    def connect(self):
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def make_pool(self, **options):
+        return ConnectionPool(self.connect, PooledDatabaseWrapperMixin.ping_connection, **options)
+
+    def test_released_connection_is_reused(self):
+        pool = self.make_pool(max_size=2)
+        connection, reused = pool.acquire()
+        self.assertFalse(reused)
+        pool.release(connection)
+
+        again, reused = pool.acquire()
+        self.assertIs(again, connection)
+        self.assertTrue(reused)
+        pool.release(again)
+        self.assertEqual(pool.stats()['created'], 1)
+        self.assertEqual(pool.stats()['idle'], 1)
+
+    def test_size_is_bounded_under_concurrency(self):
+        pool = self.make_pool(max_size=3, timeout=10)
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            for _ in range(5):
+                connection, _ = pool.acquire()
+                with lock:
+                    peak.append(pool.stats()['in_use'])
+                time.sleep(0.002)
+                pool.release(connection)
+
+        workers = [threading.Thread(target=work) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        stats = pool.stats()
+        self.assertLessEqual(max(peak), 3)
+        self.assertLessEqual(stats['created'], 3)
+        self.assertEqual(stats['in_use'], 0)
+        self.assertEqual(stats['checkouts'], 40)
+
+    def test_checkout_beyond_max_size_times_out(self):
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        connection, _ = pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        pool.release(connection)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_dead_idle_connection_is_replaced(self):
+        pool = self.make_pool(max_size=1, check_after=0)
+        connection, _ = pool.acquire()
+        pool.release(connection)
+        connection.close()
+
+        replacement, reused = pool.acquire()
+        self.assertFalse(reused)
+        self.assertIsNot(replacement, connection)
+        self.assertEqual(pool.stats()['unhealthy'], 1)
+
+    def test_discarded_connection_frees_its_slot(self):
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        connection, _ = pool.acquire()
+        pool.release(connection, discard=True)
+
+        replacement, reused = pool.acquire()
+        self.assertFalse(reused)
+        self.assertEqual(pool.stats()['discarded'], 1)
+        pool.release(replacement)
+
+    def test_expired_connection_is_not_reused(self):
+        pool = self.make_pool(max_size=1, max_lifetime=0.01)
+        connection, _ = pool.acquire()
+        pool.release(connection)
+        time.sleep(0.02)
+
+        replacement, reused = pool.acquire()
+        self.assertFalse(reused)
+        self.assertIsNot(replacement, connection)
+
+
+class PooledBackendTests(SimpleTestCase):
+    """The pooled SQLite backend returns Django connections to the pool on close."""
+
+    def test_close_returns_connection_to_pool(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        connections = ConnectionHandler({
+            'default': {'ENGINE': 'django.db.backends.dummy'},
+            'pool-test': {
+                'ENGINE': 'api.db.sqlite3',
+                'NAME': os.path.join(directory.name, 'pool.sqlite3'),
+                'POOL': {'MAX_SIZE': 2},
+            }
+        })
+        connection = connections['pool-test']
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        raw = connection.connection
+        connection.close()
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.assertIs(connection.connection, raw)
+        self.assertTrue(connection.connection_reused)
+
+        # A connection left with autocommit off is discarded
+        connection.set_autocommit(False)
+        connection.close()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.assertIsNot(connection.connection, raw)
+        connection.close()
+        self.assertEqual(get_pool_stats()['pool-test']['in_use'], 0)
@@ -0,0 +1,15 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+
+class QueryPlanTests(TestCase):
+    """The hot read endpoints keep using the composite indexes (no full scans or filesorts)."""
+
+    def test_hot_reads_use_indexes(self):
+        if connection.vendor not in ('sqlite', 'mysql'):
+            self.skipTest(f'Query plans are not checked on {connection.vendor}')
+        output = StringIO()
+        call_command('check_query_plans', trainings=1000, users=5, stdout=output)
+        self.assertIn('All query plans use indexes', output.getvalue())
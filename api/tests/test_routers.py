@@ -0,0 +1,120 @@
+import time
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+
+from api.db import routers
+from api.middleware import ReplicaRoutingMiddleware
+from api.models import IdempotencyKey, RevokedToken, Training
+
+
+REPLICAS = ['replica-a', 'replica-b']
+
+
+class RouterTestMixin:
+
+    def setUp(self):
+        self.router = routers.ReplicaRouter()
+
+    def route(self, safe, model=Training, user_id=None):
+        token = routers.start_request(safe)
+        try:
+            if user_id is not None:
+                routers.use_primary_if_pinned(user_id)
+            return self.router.db_for_read(model), self.router.db_for_write(model)
+        finally:
+            routers.end_request(token)
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS, REPLICA_PIN_CACHE_ALIAS=None)
+class ReplicaRouterTests(RouterTestMixin, TransactionTestCase):
+    """Read/write routing decisions against stand-in replica aliases."""
+
+    def test_safe_request_reads_from_a_replica(self):
+        read, write = self.route(safe=True)
+        self.assertIn(read, REPLICAS)
+        self.assertEqual(write, DEFAULT_DB_ALIAS)
+        self.assertIsNone(routers.get_read_alias())
+
+    def test_unsafe_request_reads_from_the_primary(self):
+        self.assertEqual(self.route(safe=False), (DEFAULT_DB_ALIAS, DEFAULT_DB_ALIAS))
+
+    def test_primary_only_models(self):
+        for model in (RevokedToken, IdempotencyKey):
+            read, _ = self.route(safe=True, model=model)
+            self.assertEqual(read, DEFAULT_DB_ALIAS, model.__name__)
+
+    def test_reads_inside_a_transaction_use_the_primary(self):
+        token = routers.start_request(safe=True)
+        try:
+            with transaction.atomic():
+                read = self.router.db_for_read(Training)
+        finally:
+            routers.end_request(token)
+        self.assertEqual(read, DEFAULT_DB_ALIAS)
+
+    def test_no_replicas_configured(self):
+        with override_settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(self.route(safe=True)[0], DEFAULT_DB_ALIAS)
+
+
+class ReplicaPinTests(RouterTestMixin, TransactionTestCase):
+    """Read-your-writes pins, per process and through the shared cache."""
+
+    def check_pin(self):
+        writer, other = -1, -2
+        routers.pin_user(writer)
+        self.assertEqual(self.route(safe=True, user_id=writer)[0], DEFAULT_DB_ALIAS)
+        self.assertIn(self.route(safe=True, user_id=other)[0], REPLICAS)
+
+        time.sleep(0.25)
+        self.assertIn(self.route(safe=True, user_id=writer)[0], REPLICAS)
+
+    @override_settings(DATABASE_REPLICAS=REPLICAS, REPLICA_PIN_SECONDS=0.2, REPLICA_PIN_CACHE_ALIAS=None)
+    def test_local_pin(self):
+        self.check_pin()
+
+    @override_settings(DATABASE_REPLICAS=REPLICAS, REPLICA_PIN_SECONDS=0.2, REPLICA_PIN_CACHE_ALIAS='shared')
+    def test_shared_cache_pin(self):
+        self.check_pin()
+
+    @override_settings(DATABASE_REPLICAS=REPLICAS, REPLICA_PIN_CACHE_ALIAS='shared')
+    def test_shared_cache_is_read_from_the_primary(self):
+        cache_model = caches['shared'].cache_model_class
+        self.assertEqual(self.route(safe=True, model=cache_model)[0], DEFAULT_DB_ALIAS)
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+    """The middleware scopes the replica choice to the request, including streamed bodies."""
+
+    def test_streamed_content_reads_from_the_request_replica(self):
+        seen = {}
+
+        def rows():
+            for index in range(3):
+                seen[index] = routers.get_read_alias()
+                yield f'{index}\n'
+
+        def view(request):
+            seen['view'] = routers.get_read_alias()
+            return StreamingHttpResponse(rows())
+
+        response = ReplicaRoutingMiddleware(view)(RequestFactory().get('/'))
+        self.assertIsNone(routers.get_read_alias())
+
+        self.assertEqual(b''.join(response.streaming_content), b'0\n1\n2\n')
+        self.assertIn(seen['view'], REPLICAS)
+        self.assertEqual({seen[index] for index in range(3)}, {seen['view']})
+        self.assertIsNone(routers.get_read_alias())
+
+    def test_unsafe_request_reads_from_the_primary(self):
+        seen = []
+
+        def view(request):
+            seen.append(routers.get_read_alias())
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(RequestFactory().post('/'))
+        self.assertEqual(seen, [None])
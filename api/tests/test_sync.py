@@ -0,0 +1,48 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from api.authentication import generate_jwt_token
+from api.models import Exercise, Muscle, Training, User
+
+
+# The in-process response cache would outlive each test's rolled-back data
+@override_settings(RESPONSE_CACHE_TTLS={})
+class SyncChangeValidationTests(APITestCase):
+    """Malformed sync changes are reported per index instead of failing the request."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='lifter@example.com', password='Secret123!x', username='lifter', first_name='Lift', last_name='Er'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+        muscle = Muscle.objects.create(name='legs')
+        self.exercise = Exercise.objects.create(user=self.user, muscle=muscle, name='Squat')
+        self.training = Training.objects.create(
+            user=self.user, exercise=self.exercise, weight='100.00', sets=3, repetitions=5
+        )
+
+    def sync(self, trainings):
+        response = self.client.post('/api/sync/', {'trainings': trainings}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_non_integer_id_is_a_per_index_error(self):
+        data = self.sync([{'id': 'abc', 'deleted': True}, {'id': self.training.id, 'deleted': True}])
+
+        self.assertEqual(data['errors']['trainings'][0]['index'], 0)
+        self.assertIn('id', data['errors']['trainings'][0]['errors'])
+        self.assertEqual(data['results']['trainings'], [
+            {'id': self.training.id, 'client_id': self.training.client_id, 'status': 'deleted'}
+        ])
+
+    def test_non_boolean_deleted_is_rejected(self):
+        data = self.sync([{'id': self.training.id, 'deleted': 'false'}])
+
+        self.assertIn('deleted', data['errors']['trainings'][0]['errors'])
+        self.assertTrue(Training.objects.filter(id=self.training.id).exists())
+
+    def test_boolean_deleted_deletes(self):
+        data = self.sync([{'id': self.training.id, 'deleted': True}])
+
+        self.assertEqual(data['results']['trainings'][0]['status'], 'deleted')
+        self.assertFalse(Training.objects.filter(id=self.training.id).exists())
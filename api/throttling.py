@@ -0,0 +1,186 @@
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .caching import LRUCache
+
+
+class LocalThrottleStore:
+    """In-process store of per-window request counters (per worker process)."""
+
+    def __init__(self, max_size=100000):
+        self._counters = LRUCache(max_size=max_size)
+        self._lock = threading.Lock()
+
+    def counts(self, key, window):
+        """Return the (previous, current) window counts for a key."""
+        entry = self._counters.get(key)
+        if entry is None:
+            return 0, 0
+        entry_window, current, previous = entry
+        if entry_window == window:
+            return previous, current
+        if entry_window == window - 1:
+            return current, 0
+        return 0, 0
+
+    def increment(self, key, window, duration, amount=1):
+        """Add to the current window count of a key and return the new count."""
+        with self._lock:
+            previous, current = self.counts(key, window)
+            current += amount
+            # Counters are useless once the following window has ended
+            self._counters.set(key, (window, current, previous), expires_at=(window + 2) * duration)
+        return current
+
+    def decrement(self, key, window, duration):
+        self.increment(key, window, duration, amount=-1)
+
+
+class CacheThrottleStore:
+    """Store keeping the counters in a Django cache shared by all workers."""
+
+    key_prefix = 'throttle'
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_key(self, key, window):
+        return f'{self.key_prefix}:{key}:{window}'
+
+    def counts(self, key, window):
+        previous_key, current_key = self.get_key(key, window - 1), self.get_key(key, window)
+        values = self.cache.get_many([previous_key, current_key])
+        return values.get(previous_key, 0), values.get(current_key, 0)
+
+    def increment(self, key, window, duration):
+        """Atomically add one to the current window count of a key and return the new count."""
+        cache = self.cache
+        cache_key = self.get_key(key, window)
+        if cache.add(cache_key, 1, 2 * duration):
+            return 1
+        try:
+            return cache.incr(cache_key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(cache_key, 1, 2 * duration)
+            return 1
+
+    def decrement(self, key, window, duration):
+        try:
+            self.cache.decr(self.get_key(key, window))
+        except ValueError:
+            pass
+
+
+_local_store = LocalThrottleStore()
+
+
+def get_throttle_store():
+    """Return the shared cache store when THROTTLE_CACHE_ALIAS is set, else the in-process one."""
+    alias = getattr(settings, 'THROTTLE_CACHE_ALIAS', None)
+    if alias:
+        return CacheThrottleStore(alias)
+    return _local_store
+
+
+def parse_rate(rate):
+    """Parse a DRF-style rate such as '100/min' into (requests, duration in seconds)."""
+    num, period = rate.split('/')
+    duration = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+    return int(num), duration
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Sliding-window rate limit per user (or per client IP when anonymous).
+
+    The request count over the last window is estimated from two fixed window
+    counters, weighting the previous window by how much of it still overlaps.
+    Rates come from REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] keyed by scope:
+    the throttle's ``scope``, else the view's ``throttle_scope``, else ``read``
+    for safe methods and ``write`` otherwise. Scopes without a rate are not
+    throttled. The state of the decision is stored on the request for
+    RateLimitHeadersMiddleware.
+
+    A request is counted before it is checked, with one atomic increment, so
+    concurrent requests cannot all pass on the same count; a rejected request
+    gives its count back.
+    """
+
+    scope = None
+
+    def get_scope(self, request, view):
+        if self.scope:
+            return self.scope
+        scope = getattr(view, 'throttle_scope', None)
+        if scope:
+            return scope
+        return 'read' if request.method in ('GET', 'HEAD', 'OPTIONS') else 'write'
+
+    def get_rate(self, scope):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        rate = self.get_rate(scope)
+        if rate is None:
+            return True
+
+        limit, duration = parse_rate(rate)
+        store = get_throttle_store()
+        key = f'{scope}:{self.get_ident_key(request)}'
+
+        now = time.time()
+        window = int(now // duration)
+        elapsed = now - window * duration
+        previous, _ = store.counts(key, window)
+        current = store.increment(key, window, duration)
+        weight = 1 - elapsed / duration
+        used = previous * weight + current
+
+        allowed = used <= limit
+        if allowed:
+            self._wait = None
+        else:
+            store.decrement(key, window, duration)
+            used -= 1
+            self._wait = self.get_wait(used, previous, limit, duration, elapsed)
+
+        request._request.rate_limit = {
+            'policy': f'{limit};w={duration}',
+            'limit': limit,
+            'remaining': max(int(limit - used), 0),
+            'reset': math.ceil(duration - elapsed),
+        }
+        return allowed
+
+    def get_wait(self, used, previous, limit, duration, elapsed):
+        """Seconds until the estimated count drops enough for one more request."""
+        window_left = duration - elapsed
+        excess = used + 1 - limit
+        if previous and excess * duration / previous <= window_left:
+            return math.ceil(excess * duration / previous)
+        return math.ceil(window_left)
+
+    def wait(self):
+        return self._wait
+
+
+class AuthRateThrottle(SlidingWindowThrottle):
+    """Throttle for the unauthenticated login, registration and refresh endpoints."""
+
+    scope = 'auth'
@@ -0,0 +1,44 @@
+from copy import copy
+from django.db import transaction
+
+from .models import Training
+from .rollups import apply_training
+from .stats import record_training, refresh_exercise_stats
+
+
+def create_training(serializer, user, datetime=None, **kwargs):
+    """
+    Save a new training and fold it into the stats and rollups.
+
+    ``datetime`` overrides the auto-set creation time, e.g. for trainings
+    logged offline and synced later.
+    """
+    with transaction.atomic():
+        training = serializer.save(user=user, **kwargs)
+        if datetime is not None:
+            Training.objects.filter(pk=training.pk).update(datetime=datetime)
+            training.datetime = datetime
+        record_training(training)
+        apply_training(training)
+    return training
+
+
+def update_training(serializer):
+    """Save changes to a training and refresh the affected stats and rollups."""
+    with transaction.atomic():
+        previous = copy(serializer.instance)
+        training = serializer.save()
+        apply_training(previous, sign=-1)
+        apply_training(training)
+        refresh_exercise_stats(training.user_id, training.exercise_id)
+        if previous.exercise_id != training.exercise_id:
+            refresh_exercise_stats(training.user_id, previous.exercise_id)
+    return training
+
+
+def delete_training(instance):
+    """Delete a training and remove it from the stats and rollups."""
+    with transaction.atomic():
+        instance.delete()
+        refresh_exercise_stats(instance.user_id, instance.exercise_id)
+        apply_training(instance, sign=-1)
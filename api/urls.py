@@ -11,8 +11,16 @@ urlpatterns = [
     # Authentication endpoints
     path('auth/register/', views.register, name='register'),
     path('auth/login/', views.login, name='login'),
+    path('auth/refresh/', views.refresh, name='token-refresh'),
+    path('auth/logout/', views.logout, name='logout'),
     path('auth/profile/', views.profile, name='profile'),
     
+    # Offline sync
+    path('sync/', views.sync, name='sync'),
+    
+    # Monitoring endpoints
+    path('metrics/', views.metrics_view, name='metrics'),
+    
     # Router URLs
     path('', include(router.urls)),
 ]
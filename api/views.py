@@ -1,35 +1,81 @@
 from rest_framework import viewsets, status, generics
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.exceptions import AuthenticationFailed, NotFound
+from rest_framework.decorators import api_view, permission_classes, throttle_classes, action
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from django.contrib.auth import authenticate
-from django.db.models import Min, Max, Q
-from datetime import timedelta
-from django.utils import timezone
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from drf_spectacular.types import OpenApiTypes
 
-from .models import User, Muscle, Exercise, Training
+from .models import User, Muscle, Exercise, Training, ArchivedTraining
 from .serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
+    TokenRefreshSerializer,
+    LogoutSerializer,
     UserSerializer,
     MuscleSerializer,
     ExerciseSerializer,
     TrainingSerializer,
-    TrainingStatsSerializer
+    TrainingStatsSerializer,
+    TrainingRollupSerializer,
+    TrainingBulkItemSerializer,
+    SyncRequestSerializer,
+    ExerciseBulkItemSerializer
 )
-from .authentication import generate_jwt_token
+from . import metrics
+from .archive import reaches_archive, restore_from_archive
+from .authentication import (
+    decode_refresh_token,
+    generate_jwt_token,
+    generate_refresh_token,
+    revocation_list,
+    token_cache,
+    user_cache,
+)
+from .backends import LoginCapacityExceeded
+from .changes import lock_user_changes, record_changes
+from .conditional import bump_data_version, conditional_on_data_version
+from .db.pool import get_pool_stats
+from .exports import iterate_training_rows, stream_csv, stream_ndjson
+from .fast_serializers import FastExerciseSerializer, FastTrainingSerializer
+from .filters import PERIOD_CHOICES, filter_by_period
+from .idempotency import idempotent
+from .mixins import FastListMixin, SparseFieldsMixin
+from .muscles import MuscleCatalog, muscle_registry
+from .pagination import ExerciseCursorPagination, TrainingCursorPagination
+from .renderers import CSVRenderer, NDJSONRenderer
+from .response_cache import add_hit_ratios, cached_response
+from .rollups import GRANULARITIES, apply_trainings, read_rollups
+from .stats import read_exercise_stats, record_trainings
+from .sync import ExerciseChangeApplier, TrainingChangeApplier, apply_changes, build_delta
+from .throttling import AuthRateThrottle
+from .trainings import create_training, delete_training, update_training
+
 
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name='Idempotency-Key',
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description='Unique key per logical request; retries with the same key replay the first response instead of running again'
+)
 
 @extend_schema(
     tags=['Authentication'],
     request=UserRegistrationSerializer,
     responses={201: UserSerializer},
+    parameters=[IDEMPOTENCY_KEY_PARAMETER],
     description='Register a new user with email, password, first name, last name, and username (nickname)'
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AuthRateThrottle])
+@idempotent
 def register(request):
     """Register a new user."""
     serializer = UserRegistrationSerializer(data=request.data)
@@ -49,7 +95,8 @@ def register(request):
     responses={200: {
         'type': 'object',
         'properties': {
-            'token': {'type': 'string', 'description': 'JWT authentication token'},
+            'token': {'type': 'string', 'description': 'Short-lived JWT access token'},
+            'refresh': {'type': 'string', 'description': 'Refresh token for /api/auth/refresh/'},
             'user': {'type': 'object', 'description': 'User profile information'},
             'message': {'type': 'string', 'description': 'Success message'}
         }
@@ -76,6 +123,7 @@ def register(request):
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AuthRateThrottle])
 def login(request):
     """Login a user with email or username and return JWT token."""
     serializer = UserLoginSerializer(data=request.data)
@@ -83,25 +131,20 @@ def login(request):
         email_or_username = serializer.validated_data['email_or_username']
         password = serializer.validated_data['password']
         
-        # Try to find user by email or username
-        user = None
+        # EmailOrUsernameBackend resolves the user and checks the password in one query
         try:
-            # Check if input is an email
-            if '@' in email_or_username:
-                user_obj = User.objects.get(email=email_or_username)
-            else:
-                user_obj = User.objects.get(username=email_or_username)
-            
-            # Authenticate with email (Django's USERNAME_FIELD)
-            user = authenticate(request, username=user_obj.email, password=password)
-        except User.DoesNotExist:
-            pass
+            user = authenticate(request, username=email_or_username, password=password)
+        except LoginCapacityExceeded:
+            return Response({
+                'error': 'Too many login attempts in progress. Please retry shortly.'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': '1'})
         
         if user is not None:
             token = generate_jwt_token(user)
             user_serializer = UserSerializer(user)
             return Response({
                 'token': token,
+                'refresh': generate_refresh_token(user),
                 'user': user_serializer.data,
                 'message': 'Login successful'
             }, status=status.HTTP_200_OK)
@@ -113,6 +156,84 @@ def login(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@extend_schema(
+    tags=['Authentication'],
+    request=TokenRefreshSerializer,
+    responses={200: {
+        'type': 'object',
+        'properties': {
+            'token': {'type': 'string', 'description': 'New short-lived JWT access token'},
+            'refresh': {'type': 'string', 'description': 'New refresh token; the submitted one is revoked'}
+        }
+    }},
+    description='Exchange a refresh token for a new access token and refresh token. Each refresh token can be used only once.'
+)
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@throttle_classes([AuthRateThrottle])
+def refresh(request):
+    """Rotate a refresh token into a new token pair."""
+    serializer = TokenRefreshSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        payload = decode_refresh_token(serializer.validated_data['refresh'])
+    except AuthenticationFailed as exc:
+        return Response({'error': exc.detail}, status=status.HTTP_401_UNAUTHORIZED)
+    if not revocation_list.revoke(payload):
+        return Response({
+            'error': 'Refresh token has already been used or revoked.'
+        }, status=status.HTTP_401_UNAUTHORIZED)
+    
+    try:
+        user = user_cache.get(payload['user_id'])
+    except User.DoesNotExist:
+        user = None
+    if user is None or not user.is_active:
+        return Response({'error': 'User not found or inactive.'}, status=status.HTTP_401_UNAUTHORIZED)
+    
+    return Response({
+        'token': generate_jwt_token(user),
+        'refresh': generate_refresh_token(user)
+    }, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=['Authentication'],
+    request=LogoutSerializer,
+    responses={200: {
+        'type': 'object',
+        'properties': {
+            'message': {'type': 'string', 'description': 'Success message'}
+        }
+    }},
+    description='Revoke the current access token and, if given, a refresh token of the same user'
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def logout(request):
+    """Revoke the current access token and optionally a refresh token."""
+    serializer = LogoutSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    refresh_payload = None
+    refresh_token = serializer.validated_data.get('refresh')
+    if refresh_token:
+        refresh_payload = decode_refresh_token(refresh_token)
+        if refresh_payload['user_id'] != request.user.id:
+            return Response({'error': 'Refresh token belongs to another user.'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    payload = token_cache.decode(request.auth)
+    if 'jti' in payload:
+        revocation_list.revoke(payload)
+    if refresh_payload is not None:
+        revocation_list.revoke(refresh_payload)
+    
+    return Response({'message': 'Logout successful'}, status=status.HTTP_200_OK)
+
+
 @extend_schema(
     tags=['Authentication'],
     responses={200: UserSerializer},
@@ -126,30 +247,257 @@ def profile(request):
     return Response(serializer.data)
 
 
+@extend_schema(
+    tags=['Sync'],
+    request=SyncRequestSerializer,
+    responses={200: {
+        'type': 'object',
+        'properties': {
+            'cursor': {'type': 'integer', 'description': 'Cursor to send with the next sync'},
+            'has_more': {'type': 'boolean', 'description': 'More changes are waiting; sync again with the new cursor'},
+            'exercises': {'type': 'array', 'items': {'type': 'object'}, 'description': 'Exercises created or updated since the cursor'},
+            'trainings': {'type': 'array', 'items': {'type': 'object'}, 'description': 'Trainings created or updated since the cursor'},
+            'deleted': {'type': 'object', 'description': 'IDs of exercises and trainings deleted since the cursor'},
+            'results': {'type': 'object', 'description': 'Outcome of every applied change, per model'},
+            'errors': {'type': 'object', 'description': 'Changes that were rejected, by index, per model'}
+        }
+    }},
+    description=(
+        'Offline delta sync. Applies queued local changes (exercises first, then trainings) idempotently '
+        'using client-generated UUIDs, then returns the exercises and trainings changed since the cursor '
+        'together with tombstones of deleted ones.'
+    )
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def sync(request):
+    """Apply client changes and return the server changes since the client's cursor."""
+    serializer = SyncRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    exercise_results, exercise_errors = apply_changes(
+        ExerciseChangeApplier(request), serializer.validated_data['exercises']
+    )
+    training_results, training_errors = apply_changes(
+        TrainingChangeApplier(request), serializer.validated_data['trainings']
+    )
+    
+    delta = build_delta(
+        request.user,
+        serializer.validated_data.get('cursor') or 0,
+        getattr(settings, 'SYNC_MAX_CHANGES', 1000)
+    )
+    delta['results'] = {'exercises': exercise_results, 'trainings': training_results}
+    delta['errors'] = {'exercises': exercise_errors, 'trainings': training_errors}
+    return Response(delta)
+
+
+@extend_schema(
+    tags=['Monitoring'],
+    responses={200: OpenApiTypes.OBJECT},
+    description='In-process performance counters and database pool usage of the worker serving the request (staff only)'
+)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics_view(request):
+    """Return the performance counters recorded by this process."""
+    data = add_hit_ratios(metrics.snapshot())
+    data['db_pool'] = get_pool_stats()
+    return Response(data)
+
+
 @extend_schema(tags=['Muscles'])
 class MuscleViewSet(viewsets.ReadOnlyModelViewSet):
-    """ViewSet for listing muscle groups."""
+    """
+    ViewSet for listing muscle groups.
+    
+    Served from the in-process muscle registry: JSON responses are pre-encoded
+    bytes with a strong ETag and a long Cache-Control, so no query runs.
+    """
     
     queryset = Muscle.objects.all()
     serializer_class = MuscleSerializer
     permission_classes = [IsAuthenticated]
+    
+    def list(self, request, *args, **kwargs):
+        catalog = muscle_registry.get_catalog()
+        return self.catalog_response(request, catalog.list_body, catalog.data)
+    
+    def retrieve(self, request, *args, **kwargs):
+        catalog = muscle_registry.get_catalog()
+        try:
+            muscle_id = int(kwargs[self.lookup_field])
+            body = catalog.detail_bodies[muscle_id]
+        except (KeyError, ValueError):
+            raise NotFound()
+        return self.catalog_response(request, body, catalog.items[muscle_id])
+    
+    def catalog_response(self, request, body, data):
+        """Return the pre-encoded body for JSON requests and regular rendering otherwise."""
+        if request.accepted_renderer.format != 'json':
+            return Response(data)
+        
+        etag = MuscleCatalog.get_etag(body)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=getattr(settings, 'MUSCLE_CACHE_MAX_AGE', 86400))
+        return response
 
 
 @extend_schema(tags=['Exercises'])
-class ExerciseViewSet(viewsets.ModelViewSet):
+class ExerciseViewSet(SparseFieldsMixin, FastListMixin, viewsets.ModelViewSet):
     """ViewSet for managing exercises."""
     
     serializer_class = ExerciseSerializer
+    fast_serializer_class = FastExerciseSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ExerciseCursorPagination
     
     def get_queryset(self):
         """Return exercises for the current user only."""
-        return Exercise.objects.filter(user=self.request.user).select_related('muscle')
+        return Exercise.objects.filter(user=self.request.user)
+    
+    @extend_schema(parameters=[IDEMPOTENCY_KEY_PARAMETER])
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """Create an exercise; retries with the same Idempotency-Key replay the first response."""
+        return super().create(request, *args, **kwargs)
     
     def perform_create(self, serializer):
         """Create an exercise for the current user."""
         serializer.save(user=self.request.user)
     
+    @cached_response('exercise-detail')
+    def retrieve(self, request, *args, **kwargs):
+        """Return one exercise of the current user."""
+        return super().retrieve(request, *args, **kwargs)
+    
+    @extend_schema(
+        request=ExerciseBulkItemSerializer(many=True),
+        responses={200: {
+            'type': 'object',
+            'properties': {
+                'created': {'type': 'array', 'items': {'type': 'object'}, 'description': 'Exercises that did not exist yet'},
+                'updated': {'type': 'array', 'items': {'type': 'object'}, 'description': 'Existing exercises whose note changed'},
+                'unchanged': {'type': 'array', 'items': {'type': 'object'}, 'description': 'Existing exercises left as they were'}
+            }
+        }},
+        description=(
+            'Create or update several exercises at once, matched on (muscle, name). '
+            'If any entry is invalid nothing is written and the response lists the errors per entry '
+            '(an empty object for valid entries).'
+        )
+    )
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Upsert a list of exercises keyed on (muscle, name)."""
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'Expected a non-empty list of exercises.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        max_items = getattr(settings, 'EXERCISES_BULK_MAX_ITEMS', 200)
+        if len(items) > max_items:
+            return Response({
+                'error': f'At most {max_items} exercises can be imported at once.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        context = self.get_serializer_context()
+        entries = [ExerciseBulkItemSerializer(data=item, context=context) for item in items]
+        errors = [{} if entry.is_valid() else entry.errors for entry in entries]
+        
+        # Names are matched the way the database collation compares them, so
+        # "Bench" and "bench" are the same exercise
+        muscles = Muscle.objects.in_bulk({entry.validated_data['muscle'] for entry in entries if not entry.errors})
+        keys = set()
+        for index, entry in enumerate(entries):
+            if entry.errors:
+                continue
+            key = (entry.validated_data['muscle'], Exercise.get_name_key(entry.validated_data['name']))
+            if key[0] not in muscles:
+                errors[index] = {'muscle': [f'Invalid pk "{key[0]}" - object does not exist.']}
+            elif key in keys:
+                errors[index] = {'name': ['This exercise appears more than once in the request.']}
+            keys.add(key)
+        
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        entry_keys = [
+            (entry.validated_data['muscle'], Exercise.get_name_key(entry.validated_data['name']))
+            for entry in entries
+        ]
+        
+        # The user's exercises of the requested muscles, matched by name key
+        user_exercises = Exercise.objects.filter(
+            user=request.user,
+            muscle_id__in={muscle_id for muscle_id, _ in keys}
+        )
+        existing = {
+            (muscle_id, Exercise.get_name_key(name)): (name, note)
+            for muscle_id, name, note in user_exercises.values_list('muscle_id', 'name', 'note')
+        }
+        
+        statuses = {}
+        # Entries without a note keep the stored one, so they are written
+        # separately with only updated_at in the conflict update
+        writes = {'note': [], 'no note': []}
+        for entry, key in zip(entries, entry_keys):
+            data = entry.validated_data
+            has_note = 'note' in data
+            if key not in existing:
+                statuses[key] = 'created'
+                name = data['name']
+            elif has_note and existing[key][1] != data['note']:
+                statuses[key] = 'updated'
+                # Existing rows keep their stored spelling of the name
+                name = existing[key][0]
+            else:
+                statuses[key] = 'unchanged'
+                continue
+            writes['note' if has_note else 'no note'].append(
+                Exercise(user=request.user, muscle_id=key[0], name=name, note=data.get('note'))
+            )
+        
+        # One INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE per kind of entry,
+        # relying on the unique constraint; bulk_create sends no signals, so the
+        # data version and change log are updated here
+        with transaction.atomic():
+            conflict_target = {}
+            if connection.features.supports_update_conflicts_with_target:
+                conflict_target['unique_fields'] = ['user', 'muscle', 'name']
+            for kind, update_fields in (('note', ['note', 'updated_at']), ('no note', ['updated_at'])):
+                if writes[kind]:
+                    Exercise.objects.bulk_create(
+                        writes[kind],
+                        update_conflicts=True,
+                        update_fields=update_fields,
+                        **conflict_target
+                    )
+            
+            exercises = {
+                (exercise.muscle_id, Exercise.get_name_key(exercise.name)): exercise
+                for exercise in user_exercises
+            }
+            # The database merged entries that the name key told apart
+            if any(key not in exercises for key in entry_keys):
+                transaction.set_rollback(True)
+                return Response([
+                    {} if key in exercises else {'name': ['This exercise appears more than once in the request.']}
+                    for key in entry_keys
+                ], status=status.HTTP_400_BAD_REQUEST)
+            
+            if writes['note'] or writes['no note']:
+                record_changes([exercises[key] for key, state in statuses.items() if state != 'unchanged'], 'upsert')
+                bump_data_version(request.user.id)
+        
+        result = {'created': [], 'updated': [], 'unchanged': []}
+        for key, state in statuses.items():
+            result[state].append(ExerciseSerializer(exercises[key]).data)
+        return Response(result, status=status.HTTP_200_OK)
+    
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -157,36 +505,185 @@ class ExerciseViewSet(viewsets.ModelViewSet):
                 type=OpenApiTypes.INT,
                 location=OpenApiParameter.QUERY,
                 description='Filter exercises by muscle ID'
+            ),
+            OpenApiParameter(
+                name='fields',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Comma-separated list of fields to return (e.g. id,name)'
             )
         ]
     )
+    @conditional_on_data_version
+    @cached_response('exercise-list')
     def list(self, request, *args, **kwargs):
         """List all exercises for the current user, optionally filtered by muscle."""
-        queryset = self.get_queryset()
+        queryset = self.filter_queryset(self.get_queryset())
         
         # Filter by muscle if provided
         muscle_id = request.query_params.get('muscle', None)
         if muscle_id:
             queryset = queryset.filter(muscle_id=muscle_id)
         
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(queryset)
 
 
 @extend_schema(tags=['Training'])
-class TrainingViewSet(viewsets.ModelViewSet):
+class TrainingViewSet(SparseFieldsMixin, FastListMixin, viewsets.ModelViewSet):
     """ViewSet for managing training sessions."""
     
     serializer_class = TrainingSerializer
+    fast_serializer_class = FastTrainingSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TrainingCursorPagination
+    # Throttled as read/write by request method unless an action sets its own scope
+    throttle_scope = None
     
     def get_queryset(self):
         """Return trainings for the current user only."""
-        return Training.objects.filter(user=self.request.user).select_related('exercise', 'exercise__muscle')
+        return Training.objects.filter(user=self.request.user).select_related('exercise')
+    
+    def get_archived_queryset(self):
+        """Return archived trainings of the current user, shaped like get_queryset()."""
+        return ArchivedTraining.objects.filter(user=self.request.user).select_related('exercise')
+    
+    def get_object(self):
+        """
+        Return a training of the current user, including archived ones.
+        
+        Archived trainings are read in place, and moved back to the training
+        table before they are updated or deleted.
+        """
+        try:
+            return super().get_object()
+        except Http404:
+            lookup = {self.lookup_field: self.kwargs[self.lookup_url_kwarg or self.lookup_field]}
+            if self.action == 'retrieve':
+                instance = generics.get_object_or_404(self.get_archived_queryset(), **lookup)
+                self.check_object_permissions(self.request, instance)
+                return instance
+            try:
+                restored = restore_from_archive(self.request.user, **lookup)
+            except (TypeError, ValueError):
+                restored = False
+            if not restored:
+                raise
+            return super().get_object()
+    
+    def get_training_querysets(self, period=None):
+        """
+        Return the training querysets a read over ``period`` must merge: the
+        hot table, plus the archive only when the period reaches archived rows.
+        """
+        querysets = [self.filter_queryset(self.get_queryset())]
+        if reaches_archive(self.request.user, period):
+            querysets.append(self.filter_queryset(self.get_archived_queryset()))
+        return querysets
+    
+    @cached_response('training-list')
+    def list(self, request, *args, **kwargs):
+        """List the trainings of the current user, including archived ones."""
+        queryset, *archived = self.get_training_querysets()
+        return self.list_response(queryset, archived)
+    
+    @extend_schema(parameters=[IDEMPOTENCY_KEY_PARAMETER])
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """Create a training session; retries with the same Idempotency-Key replay the first response."""
+        return super().create(request, *args, **kwargs)
     
     def perform_create(self, serializer):
         """Create a training session for the current user."""
-        serializer.save(user=self.request.user)
+        create_training(serializer, self.request.user)
+    
+    def perform_update(self, serializer):
+        """Update a training session and refresh the affected exercise stats."""
+        update_training(serializer)
+    
+    def perform_destroy(self, instance):
+        """Delete a training session and refresh its exercise stats."""
+        delete_training(instance)
+    
+    @extend_schema(
+        request=TrainingBulkItemSerializer(many=True),
+        responses={201: TrainingSerializer(many=True)},
+        description=(
+            'Log several training sessions at once. Either all entries are created or, '
+            'if any entry is invalid, none are and the response lists the errors per entry '
+            '(an empty object for valid entries).'
+        )
+    )
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create a list of training sessions in one transaction."""
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'Expected a non-empty list of trainings.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        max_items = getattr(settings, 'TRAININGS_BULK_MAX_ITEMS', 100)
+        if len(items) > max_items:
+            return Response({
+                'error': f'At most {max_items} trainings can be created at once.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        context = self.get_serializer_context()
+        entries = [TrainingBulkItemSerializer(data=item, context=context) for item in items]
+        errors = [{} if entry.is_valid() else entry.errors for entry in entries]
+        
+        # Ownership of every referenced exercise is checked with one query
+        exercise_ids = {entry.validated_data['exercise'] for entry in entries if not entry.errors}
+        exercises = Exercise.objects.filter(user=request.user).in_bulk(exercise_ids)
+        for index, entry in enumerate(entries):
+            if not entry.errors and entry.validated_data['exercise'] not in exercises:
+                errors[index] = {'exercise': ['You can only create trainings for your own exercises.']}
+        
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        trainings = [
+            Training(
+                user=request.user,
+                exercise=exercises[entry.validated_data['exercise']],
+                weight=entry.validated_data['weight'],
+                sets=entry.validated_data['sets'],
+                repetitions=entry.validated_data['repetitions']
+            )
+            for entry in entries
+        ]
+        
+        # bulk_create sends no signals, so stats, rollups and the data version
+        # are updated here for the whole batch
+        with transaction.atomic():
+            self.bulk_create_trainings(trainings)
+            record_trainings(trainings)
+            apply_trainings(trainings)
+            bump_data_version(request.user.id)
+            record_changes(trainings, 'upsert')
+        
+        serializer = TrainingSerializer(trainings, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    
+    def bulk_create_trainings(self, trainings):
+        """
+        Insert trainings with one query and make sure they have their primary keys.
+
+        Must run inside a transaction.
+        """
+        if connection.features.can_return_rows_from_bulk_insert:
+            Training.objects.bulk_create(trainings)
+            return
+        
+        # MySQL does not return the inserted IDs; read them back in insertion order.
+        # The lock on the user row blocks other inserts of the user's trainings
+        # (their foreign key check needs a shared lock on it) until the batch
+        # commits, so no concurrent row can land between last_id and the batch
+        lock_user_changes(self.request.user.id)
+        user_trainings = Training.objects.filter(user=self.request.user)
+        last_id = user_trainings.order_by('-id').values_list('id', flat=True).first() or 0
+        Training.objects.bulk_create(trainings)
+        created_ids = user_trainings.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)
+        for training, training_id in zip(trainings, created_ids):
+            training.id = training_id
     
     @extend_schema(
         parameters=[
@@ -195,7 +692,7 @@ class TrainingViewSet(viewsets.ModelViewSet):
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
                 description='Filter by time period: current_week, last_week, last_month, last_year',
-                enum=['current_week', 'last_week', 'last_month', 'last_year']
+                enum=PERIOD_CHOICES
             ),
             OpenApiParameter(
                 name='exercise',
@@ -208,59 +705,42 @@ class TrainingViewSet(viewsets.ModelViewSet):
                 type=OpenApiTypes.INT,
                 location=OpenApiParameter.QUERY,
                 description='Filter by muscle ID'
+            ),
+            OpenApiParameter(
+                name='fields',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Comma-separated list of fields to return (e.g. id,exercise_name,weight,datetime)'
             )
         ],
         description='Get training history with optional filters'
     )
     @action(detail=False, methods=['get'])
+    @conditional_on_data_version
+    @cached_response('training-history')
     def history(self, request):
         """Get training history with optional time period filter."""
-        queryset = self.get_queryset()
-        
-        # Filter by time period
         period = request.query_params.get('period', None)
-        if period:
-            now = timezone.now()
-            
-            if period == 'current_week':
-                # Get current week (Monday to Sunday)
-                start_of_week = now - timedelta(days=now.weekday())
-                start_date = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
-                queryset = queryset.filter(datetime__gte=start_date)
+        exercise_id = request.query_params.get('exercise', None)
+        muscle_id = request.query_params.get('muscle', None)
+        
+        # Archived trainings are only read when the period reaches back to them
+        querysets = []
+        for queryset in self.get_training_querysets(period):
+            # Filter by time period
+            queryset = filter_by_period(queryset, period)
             
-            elif period == 'last_week':
-                # Get last week (Monday to Sunday)
-                start_of_current_week = now - timedelta(days=now.weekday())
-                end_of_last_week = start_of_current_week - timedelta(seconds=1)
-                start_of_last_week = end_of_last_week - timedelta(days=6)
-                start_of_last_week = start_of_last_week.replace(hour=0, minute=0, second=0, microsecond=0)
-                queryset = queryset.filter(
-                    datetime__gte=start_of_last_week,
-                    datetime__lte=end_of_last_week
-                )
+            # Filter by exercise
+            if exercise_id:
+                queryset = queryset.filter(exercise_id=exercise_id)
             
-            elif period == 'last_month':
-                # Get last 30 days
-                start_date = now - timedelta(days=30)
-                queryset = queryset.filter(datetime__gte=start_date)
+            # Filter by muscle
+            if muscle_id:
+                queryset = queryset.filter(exercise__muscle_id=muscle_id)
             
-            elif period == 'last_year':
-                # Get last 365 days
-                start_date = now - timedelta(days=365)
-                queryset = queryset.filter(datetime__gte=start_date)
-        
-        # Filter by exercise
-        exercise_id = request.query_params.get('exercise', None)
-        if exercise_id:
-            queryset = queryset.filter(exercise_id=exercise_id)
-        
-        # Filter by muscle
-        muscle_id = request.query_params.get('muscle', None)
-        if muscle_id:
-            queryset = queryset.filter(exercise__muscle_id=muscle_id)
+            querysets.append(queryset)
         
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(querysets[0], querysets[1:])
     
     @extend_schema(
         parameters=[
@@ -281,48 +761,113 @@ class TrainingViewSet(viewsets.ModelViewSet):
         description='Get training statistics including low, high, and last weight for each exercise'
     )
     @action(detail=False, methods=['get'])
+    @conditional_on_data_version
+    @cached_response('training-stats')
     def stats(self, request):
         """Get training statistics (low, high, last weight) for each exercise."""
-        queryset = self.get_queryset()
-        
-        # Filter by exercise
-        exercise_id = request.query_params.get('exercise', None)
-        if exercise_id:
-            queryset = queryset.filter(exercise_id=exercise_id)
+        # Read from the materialized stats table
+        stats = read_exercise_stats(
+            request.user,
+            exercise_id=request.query_params.get('exercise', None),
+            muscle_id=request.query_params.get('muscle', None)
+        )
         
-        # Filter by muscle
-        muscle_id = request.query_params.get('muscle', None)
-        if muscle_id:
-            queryset = queryset.filter(exercise__muscle_id=muscle_id)
+        serializer = TrainingStatsSerializer(stats, many=True)
+        return Response(serializer.data)
+    
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='granularity',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Bucket size of the rollup: day, week or month (defaults to week)',
+                enum=GRANULARITIES
+            ),
+            OpenApiParameter(
+                name='period',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Limit buckets to a time period: current_week, last_week, last_month, last_year',
+                enum=PERIOD_CHOICES
+            ),
+            OpenApiParameter(
+                name='exercise',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='Filter rollups by exercise ID'
+            ),
+            OpenApiParameter(
+                name='muscle',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='Filter rollups by muscle ID'
+            ),
+            OpenApiParameter(
+                name='group_by',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Return one row per exercise (default) or per muscle in each bucket',
+                enum=['exercise', 'muscle']
+            )
+        ],
+        responses={200: TrainingRollupSerializer(many=True)},
+        description='Get training volume (weight x sets x repetitions) aggregated by day, week or month'
+    )
+    @action(detail=False, methods=['get'])
+    @conditional_on_data_version
+    def rollups(self, request):
+        """Get pre-aggregated training volume per time bucket."""
+        granularity = request.query_params.get('granularity', 'week')
+        if granularity not in GRANULARITIES:
+            return Response({
+                'granularity': f'Must be one of: {", ".join(GRANULARITIES)}.'
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Get unique exercises from the filtered trainings
-        exercises = Exercise.objects.filter(
-            id__in=queryset.values_list('exercise_id', flat=True).distinct()
-        ).select_related('muscle')
+        group_by = request.query_params.get('group_by', 'exercise')
+        if group_by not in ('exercise', 'muscle'):
+            return Response({
+                'group_by': 'Must be one of: exercise, muscle.'
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        stats = []
-        for exercise in exercises:
-            exercise_trainings = queryset.filter(exercise=exercise)
-            
-            if exercise_trainings.exists():
-                # Get min and max weights
-                weight_stats = exercise_trainings.aggregate(
-                    low_weight=Min('weight'),
-                    high_weight=Max('weight')
-                )
-                
-                # Get last weight (most recent training)
-                last_training = exercise_trainings.first()
-                
-                stats.append({
-                    'exercise_id': exercise.id,
-                    'exercise_name': exercise.name,
-                    'muscle_name': exercise.muscle.name,
-                    'low_weight': weight_stats['low_weight'],
-                    'high_weight': weight_stats['high_weight'],
-                    'last_weight': last_training.weight,
-                    'total_sessions': exercise_trainings.count()
-                })
+        rollups = read_rollups(
+            request.user,
+            granularity,
+            period=request.query_params.get('period', None),
+            exercise_id=request.query_params.get('exercise', None),
+            muscle_id=request.query_params.get('muscle', None),
+            group_by=group_by
+        )
         
-        serializer = TrainingStatsSerializer(stats, many=True)
+        serializer = TrainingRollupSerializer(rollups, many=True)
         return Response(serializer.data)
+    
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='format',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Export format: ndjson (default) or csv',
+                enum=['ndjson', 'csv']
+            )
+        ],
+        responses={(200, 'application/x-ndjson'): OpenApiTypes.STR, (200, 'text/csv'): OpenApiTypes.STR},
+        description='Stream the full training log of the current user as NDJSON or CSV'
+    )
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer], throttle_scope='export')
+    def export(self, request):
+        """Stream the full training log without building it in memory."""
+        querysets = [self.get_queryset()]
+        if reaches_archive(request.user, None):
+            querysets.append(self.get_archived_queryset())
+        rows = iterate_training_rows(querysets)
+        
+        if request.accepted_renderer.format == 'csv':
+            content, filename = stream_csv(rows), 'trainings.csv'
+        else:
+            content, filename = stream_ndjson(rows), 'trainings.ndjson'
+        
+        response = StreamingHttpResponse(content, content_type=request.accepted_media_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
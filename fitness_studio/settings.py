@@ -35,6 +35,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
+    'api.middleware.RateLimitHeadersMiddleware',
+    'api.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -70,7 +73,9 @@ WSGI_APPLICATION = 'fitness_studio.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        # MySQL backend with a per-process connection pool (api/db/pool.py);
+        # 'api.db.sqlite3' is the pooled SQLite stand-in for local work
+        'ENGINE': 'api.db.mysql',
         'NAME': 'fitness_studio_db',
         'USER': 'root',
         'PASSWORD': 'Intothenight378#',
@@ -80,7 +85,44 @@ DATABASES = {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
             'charset': 'utf8mb4',
         },
-    }
+        # Connections go back to the pool when Django closes them after each
+        # request, so they are not kept on the request thread
+        'CONN_MAX_AGE': 0,
+        'POOL': {
+            'MAX_SIZE': 10,  # connections per process, in use or idle
+            'TIMEOUT': 10,  # seconds a checkout waits for a free connection
+            'MAX_LIFETIME': 1800,  # seconds before a connection is replaced
+            'CHECK_AFTER': 5,  # idle seconds after which a checkout pings first
+        },
+    },
+    # Read replicas are added as further aliases with the same settings but
+    # their own HOST, listed in DATABASE_REPLICAS, e.g.
+    # 'replica': {..., 'HOST': 'replica.db.internal', 'TEST': {'MIRROR': 'default'}},
+}
+
+# Reads of GET/HEAD/OPTIONS requests go to one of these aliases (chosen per
+# request); writes and all other requests use the primary. Empty disables it.
+DATABASE_ROUTERS = ['api.db.routers.ReplicaRouter']
+DATABASE_REPLICAS = []
+
+# After a write a user reads from the primary for this many seconds, so
+# replication lag never hides their own changes. Pins must be visible to every
+# worker, so they live in the shared cache (None keeps them per process, which
+# is only correct with a single worker)
+REPLICA_PIN_SECONDS = 5
+REPLICA_PIN_CACHE_ALIAS = 'shared'
+
+# 'default' is per worker process. 'shared' is seen by all workers: a table in
+# the primary database (create it with `python manage.py createcachetable`);
+# point it at Redis or Memcached where one is available
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'shared_cache',
+    },
 }
 
 
@@ -131,6 +173,15 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom User Model
 AUTH_USER_MODEL = 'api.User'
 
+# Email-or-username login with a single user lookup
+AUTHENTICATION_BACKENDS = [
+    'api.backends.EmailOrUsernameBackend',
+]
+
+# Password hash pool used by the login backend (api.backends.PasswordHashPool)
+LOGIN_HASH_WORKERS = 4  # hashes computed concurrently
+LOGIN_HASH_MAX_PENDING = 32  # logins running or queued; further logins get a 503 at once
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -140,7 +191,87 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Fast JSON renderer/parser use orjson when installed and fall back to
+    # DRF's stdlib json implementation otherwise
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Sliding-window limits per user (per client IP when anonymous) and scope:
+    # auth for login/registration/refresh, export for the training export,
+    # read for other safe requests and write for everything else
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.SlidingWindowThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'auth': '20/min',
+        'read': '600/min',
+        'write': '120/min',
+        'export': '10/hour',
+    },
+    # Anonymous requests are throttled by client IP. With 0, that is
+    # REMOTE_ADDR and X-Forwarded-For is ignored, so it cannot be spoofed;
+    # set it to the number of reverse proxies in front of the app instead
+    'NUM_PROXIES': 0,
+}
+
+# Throttle counters are kept per worker process unless a Django cache alias
+# is set here, in which case all workers share them through that cache
+THROTTLE_CACHE_ALIAS = None
+
+# Serve list endpoints through the values_list-based fast serializers
+# (api/fast_serializers.py); output is identical to the DRF serializers
+FAST_READ_SERIALIZERS = True
+
+# Per-user read-through response cache (api.response_cache). Entries are keyed
+# by the user's data version, so every write invalidates them. A Django cache
+# alias (locmem, file-based, Redis, ...) shares them between workers; without
+# one each worker keeps its own LRU
+RESPONSE_CACHE_ALIAS = None
+RESPONSE_CACHE_SIZE = 10000  # responses kept by the per-process LRU
+RESPONSE_CACHE_TTLS = {  # seconds per endpoint; 0 or missing disables caching
+    'exercise-list': 600,
+    'exercise-detail': 600,
+    'training-list': 300,
+    'training-history': 300,
+    'training-stats': 300,
 }
+RESPONSE_CACHE_LOCK_TIMEOUT = 30  # seconds a request may hold the lock of a key it is computing
+RESPONSE_CACHE_WAIT_TIMEOUT = 5  # seconds concurrent requests wait for that result
+
+# Muscle catalog (api.muscles.MuscleRegistry), loaded once per process and
+# reloaded on Muscle save/delete signals; the TTL bounds how long other worker
+# processes keep serving a catalog edited elsewhere
+MUSCLE_REGISTRY_TTL = 3600  # seconds; 0 keeps the catalog until invalidated
+MUSCLE_CACHE_MAX_AGE = 86400  # Cache-Control max-age of /api/muscles/ responses
+
+# Maximum number of entries accepted by POST /api/trainings/bulk/
+TRAININGS_BULK_MAX_ITEMS = 100
+
+# Maximum number of entries accepted by POST /api/exercises/bulk/
+EXERCISES_BULK_MAX_ITEMS = 200
+
+# Maximum number of changes accepted from, and returned to, one POST /api/sync/
+SYNC_MAX_CHANGES = 1000
+
+# Trainings older than this many days are moved to the training_archive table
+# by the archive_trainings command. Keep it above 365 so every history period
+# (up to last_year) is served from the training table alone
+TRAINING_ARCHIVE_AFTER_DAYS = 400
+
+# Idempotency-Key handling (api.idempotency)
+IDEMPOTENCY_KEY_TTL = 86400  # seconds a completed response is replayed for
+IDEMPOTENCY_WAIT_TIMEOUT = 5  # seconds a concurrent duplicate waits before a 409
+IDEMPOTENCY_LOCK_TIMEOUT = 60  # seconds after which an unfinished request is considered abandoned
+
+# Response compression (api.middleware.CompressionMiddleware)
+# Bodies smaller than this many bytes are sent uncompressed
+COMPRESSION_MIN_SIZE = 1024
 
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True
@@ -157,4 +288,18 @@ SPECTACULAR_SETTINGS = {
 # JWT Settings
 JWT_SECRET_KEY = SECRET_KEY
 JWT_ALGORITHM = 'HS256'
-JWT_EXPIRATION_DELTA = 86400  # 24 hours in seconds
+JWT_EXPIRATION_DELTA = 900  # access tokens: 15 minutes in seconds
+JWT_REFRESH_EXPIRATION_DELTA = 1209600  # refresh tokens: 14 days in seconds
+
+# Token revocation (api.authentication.RevocationList)
+JWT_REVOCATION_SYNC_INTERVAL = 5  # seconds between syncs of other processes' revocations
+JWT_REVOCATION_FILTER_CAPACITY = 100000  # revoked tokens before the Bloom filter is rebuilt larger
+JWT_REVOCATION_FILTER_ERROR_RATE = 0.001  # false positives cost one DB lookup
+
+# Authenticated user cache (api.authentication.UserCache)
+JWT_USER_CACHE_TTL = 60  # seconds; 0 disables the cache
+JWT_USER_CACHE_SIZE = 10000  # users kept in the in-process LRU
+JWT_USER_CACHE_ALIAS = None  # optional Django cache alias for a shared tier
+
+# Verified token cache (api.authentication.TokenCache)
+JWT_TOKEN_CACHE_SIZE = 10000  # tokens kept until their exp; 0 disables the cache